@@ -0,0 +1,11 @@
+import os
+import fakes
+
+try:
+    import pyjab.jabdriver
+    import win32event
+except ImportError:
+    fakes.install_windows_modules()
+
+# Qt models are tested without a display
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
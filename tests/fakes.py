@@ -0,0 +1,414 @@
+"""
+Fakes of the Java Access Bridge for the tests.
+The Windows only modules are replaced by minimal fakes when they cannot be imported, so the pure Python
+parts of uiinspector.core.pyjab can be tested on any platform. FakeBridge serves a tree of nodes through
+the bridge functions used by JElement.
+"""
+from __future__ import annotations
+from collections import Counter
+from ctypes import Structure, byref, c_bool, c_int, c_int64, c_wchar, memmove
+from typing import Dict, List
+import logging
+import sys
+import threading
+import types
+
+MAX_STRING_SIZE = 1024
+SHORT_STRING_SIZE = 256
+MAX_VISIBLE_CHILDREN = 256
+MAX_ACTION_INFO = 256
+
+
+def _module(name: str, **attributes) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+
+class _AccessibleContextInfo(Structure):
+    _fields_ = [
+        ("name", c_wchar * MAX_STRING_SIZE),
+        ("description", c_wchar * MAX_STRING_SIZE),
+        ("role", c_wchar * SHORT_STRING_SIZE),
+        ("role_en_US", c_wchar * SHORT_STRING_SIZE),
+        ("states", c_wchar * SHORT_STRING_SIZE),
+        ("states_en_US", c_wchar * SHORT_STRING_SIZE),
+        ("indexInParent", c_int),
+        ("childrenCount", c_int),
+        ("x", c_int),
+        ("y", c_int),
+        ("width", c_int),
+        ("height", c_int),
+        ("accessibleComponent", c_int),
+        ("accessibleAction", c_int),
+        ("accessibleSelection", c_int),
+        ("accessibleText", c_int),
+        ("accessibleValue", c_int),
+    ]
+
+
+class _VisibleChildrenInfo(Structure):
+    _fields_ = [
+        ("returnedChildrenCount", c_int),
+        ("children", c_int64 * MAX_VISIBLE_CHILDREN),
+    ]
+
+
+class _AccessibleActionInfo(Structure):
+    _fields_ = [("name", c_wchar * SHORT_STRING_SIZE)]
+
+
+class _AccessibleActions(Structure):
+    _fields_ = [
+        ("actionsCount", c_int),
+        ("actionInfo", _AccessibleActionInfo * MAX_ACTION_INFO),
+    ]
+
+
+class _AccessibleTextInfo(Structure):
+    _fields_ = [
+        ("charCount", c_int),
+        ("caretIndex", c_int),
+        ("indexAtPoint", c_int),
+    ]
+
+
+class _AccessibleTableInfo(Structure):
+    _fields_ = [
+        ("caption", c_int64),
+        ("summary", c_int64),
+        ("rowCount", c_int),
+        ("columnCount", c_int),
+        ("accessibleContext", c_int64),
+        ("accessibleTable", c_int64),
+    ]
+
+
+class _AccessibleTableCellInfo(Structure):
+    _fields_ = [
+        ("accessibleContext", c_int64),
+        ("index", c_int),
+        ("row", c_int),
+        ("column", c_int),
+        ("rowExtent", c_int),
+        ("columnExtent", c_int),
+        ("isSelected", c_bool),
+    ]
+
+
+class _JABException(Exception):
+    pass
+
+
+class _JABElement:
+    """
+    Subset of pyjab.jabelement.JABElement used by JElement.
+    """
+    int_func_err_msg = "Java Access Bridge func '{}' error"
+
+    def __init__(self, bridge = None, hwnd = None, vmid = None, accessible_context = None) -> None:
+        self.logger = logging.getLogger('pyjab')
+        self.bridge = bridge
+        self.hwnd = hwnd
+        self.vmid = vmid
+        self.accessible_context = accessible_context
+        self._acc_info = self._get_accessible_context_info
+
+    def _get_accessible_context_info(self, accessible_context = None) -> _AccessibleContextInfo:
+        info = _AccessibleContextInfo()
+        if not self.bridge.getAccessibleContextInfo(self.vmid, accessible_context or self.accessible_context, byref(info)):
+            raise _JABException(self.int_func_err_msg.format("GetAccessibleContextInfo"))
+        return info
+
+    def _get_visible_children_count(self, accessible_context = None) -> int:
+        return self.bridge.getVisibleChildrenCount(self.vmid, accessible_context or self.accessible_context)
+
+    def _get_visible_children(self, accessible_context = None) -> _VisibleChildrenInfo:
+        info = _VisibleChildrenInfo()
+        if not self.bridge.getVisibleChildren(self.vmid, accessible_context or self.accessible_context, 0, byref(info)):
+            raise _JABException(self.int_func_err_msg.format("getVisibleChildren"))
+        return info
+
+    def _get_object_depth(self, accessible_context = None) -> int:
+        return self.bridge.getObjectDepth(self.vmid, accessible_context or self.accessible_context)
+
+    def _get_accessible_text_info(self, accessible_context = None) -> _AccessibleTextInfo:
+        info = _AccessibleTextInfo()
+        if not self.bridge.getAccessibleTextInfo(self.vmid, accessible_context or self.accessible_context, byref(info), 0, 0):
+            raise _JABException(self.int_func_err_msg.format("getAccessibleTextInfo"))
+        return info
+
+    def _get_accessible_text_range(self, start, end, text, length, accessible_context = None) -> None:
+        if not self.bridge.getAccessibleTextRange(self.vmid, accessible_context or self.accessible_context, start, end, text, length):
+            raise _JABException(self.int_func_err_msg.format("getAccessibleTextRange"))
+
+    def _get_accessible_table_info(self, accessible_context = None) -> _AccessibleTableInfo:
+        info = _AccessibleTableInfo()
+        if not self.bridge.getAccessibleTableInfo(self.vmid, accessible_context or self.accessible_context, byref(info)):
+            raise _JABException(self.int_func_err_msg.format("getAccessibleTableInfo"))
+        return info
+
+    def release_jabelement(self, jabelement = None) -> None:
+        self.bridge.releaseJavaObject(self.vmid, (jabelement or self).accessible_context)
+
+    @property
+    def name(self) -> str:
+        return self._acc_info().name
+
+    @property
+    def role(self) -> str:
+        return self._acc_info().role
+
+    @property
+    def role_en_us(self) -> str:
+        return self._acc_info().role_en_US
+
+    @property
+    def index_in_parent(self) -> int:
+        return self._acc_info().indexInParent
+
+    @property
+    def children_count(self) -> int:
+        return self._acc_info().childrenCount
+
+
+def _msg_wait_for_multiple_objects(handles, wait_all, milliseconds, wake_mask) -> int:
+    """
+    Wait for the first of auto reset events created by CreateEvent, there are never window messages.
+    """
+    if handles[0].wait(milliseconds / 1000):
+        handles[0].clear()
+        return 0
+    return 258
+
+
+def install_windows_modules() -> None:
+    """
+    Register fakes of pyjab and pywin32 modules in sys.modules.
+    """
+    for name in ('win32gui', 'win32process'):
+        _module(name)
+    _module('pythoncom', PumpWaitingMessages=lambda: 0)
+    _module('win32event', CreateEvent=lambda attributes, manual_reset, initial_state, name: threading.Event(),
+            SetEvent=threading.Event.set, MsgWaitForMultipleObjects=_msg_wait_for_multiple_objects,
+            WAIT_OBJECT_0=0, WAIT_TIMEOUT=258, QS_ALLINPUT=0x04FF)
+    _module('pyjab')
+    _module('pyjab.common')
+    _module('pyjab.jabdriver', JABDriver=object, JABElement=_JABElement,
+            By=types.SimpleNamespace(NAME='name', DESCRIPTION='description', ROLE='role', STATES='states',
+                                     OBJECT_DEPTH='object_depth', CHILDREN_COUNT='children_count',
+                                     INDEX_IN_PARENT='index_in_parent'))
+    _module('pyjab.jabfixedfunc', JABFixedFunc=object)
+    _module('pyjab.common.service', Service=object)
+    _module('pyjab.common.win32utils', Win32Utils=object)
+    _module('pyjab.accessibleinfo', AccessibleContextInfo=_AccessibleContextInfo, AccessibleActions=_AccessibleActions,
+            AccessibleTableInfo=_AccessibleTableInfo, AccessibleTableCellInfo=_AccessibleTableCellInfo,
+            VisibleChildrenInfo=_VisibleChildrenInfo)
+    _module('pyjab.config', MAX_VISIBLE_CHILDREN=MAX_VISIBLE_CHILDREN, TIMEOUT=30)
+    _module('pyjab.common.logger', Logger=object)
+    _module('pyjab.common.types', JOBJECT64=c_int64)
+    _module('pyjab.common.exceptions', JABException=_JABException)
+
+
+def node(role: str, name: str = '', children = (), states: str = 'enabled,showing', role_en_us: str = None,
+         text: str = None, actions = ()) -> Dict:
+    """
+    Return a node of the tree served by FakeBridge, role_en_us defaults to role.
+    Nodes with a text support the accessible text functions.
+    """
+    return {'role': role, 'role_en_US': role_en_us or role, 'name': name, 'children': list(children), 'states': states,
+            'text': text, 'actions': list(actions)}
+
+
+def table(name: str, rows: int, headers = ('A', 'B', 'C')) -> Dict:
+    """
+    Return a table node whose cells are labels named row:column, in row-major order.
+    """
+    cells = [node('label', f'{row}:{column}') for row in range(rows) for column in range(len(headers))]
+    return dict(node('table', name, cells), headers=list(headers))
+
+
+class FakeBridge:
+    """
+    Serve a tree of nodes, every returned Java object is a new handle of a node.
+    calls counts the calls of each bridge function and released lists the released handles.
+    callbacks holds the event callbacks set by their setter name.
+    """
+    def __init__(self, root: Dict):
+        self.calls = Counter()
+        self.released: List[int] = []
+        self.callbacks: Dict[str, object] = {}
+        self._nodes: Dict[int, Dict] = {}
+        # removed nodes keep their parent, so they are known as detached
+        self._parents: Dict[int, Dict] = {}
+        self._next_handle = 1
+        self._root = root
+        self.root = self.handle(root)
+
+    def _parent(self, node: Dict) -> Dict:
+        if node is not self._root and id(node) not in self._parents:
+            stack = [self._root]
+            while stack:
+                parent = stack.pop()
+                for child in parent['children']:
+                    self._parents[id(child)] = parent
+                stack.extend(parent['children'])
+        return self._parents.get(id(node))
+
+    def handle(self, node: Dict) -> int:
+        handle = self._next_handle
+        self._next_handle += 1
+        self._nodes[handle] = node
+        return handle
+
+    def node(self, handle: int) -> Dict:
+        return self._nodes[handle]
+
+    def getAccessibleContextInfo(self, vmid, accessible_context, info_ref) -> int:
+        self.calls['getAccessibleContextInfo'] += 1
+        node = self._nodes.get(accessible_context)
+        if node is None or accessible_context in self.released:
+            return 0
+        info = info_ref._obj
+        info.name = node['name']
+        info.role = node['role']
+        info.role_en_US = node['role_en_US']
+        info.states = info.states_en_US = node['states']
+        parent = self._parent(node)
+        info.indexInParent = next((i for i, c in enumerate(parent['children']) if c is node), -1) if parent else -1
+        info.childrenCount = len(node['children'])
+        info.accessibleText = node.get('text') is not None
+        return 1
+
+    def getAccessibleChildFromContext(self, vmid, accessible_context, index) -> int:
+        self.calls['getAccessibleChildFromContext'] += 1
+        children = self._nodes[accessible_context]['children']
+        return self.handle(children[index]) if 0 <= index < len(children) else 0
+
+    def getAccessibleParentFromContext(self, vmid, accessible_context) -> int:
+        self.calls['getAccessibleParentFromContext'] += 1
+        node = self._nodes[accessible_context]
+        parent = self._parent(node)
+        if parent is None or not any(child is node for child in parent['children']):
+            # a removed object has no parent
+            return 0
+        return self.handle(parent)
+
+    def getTopLevelObject(self, vmid, accessible_context) -> int:
+        self.calls['getTopLevelObject'] += 1
+        node = self._nodes[accessible_context]
+        while (parent := self._parent(node)) is not None:
+            node = parent
+        return self.handle(node)
+
+    def _visible_children(self, accessible_context) -> List[Dict]:
+        return [child for child in self._nodes[accessible_context]['children'] if 'showing' in child['states']]
+
+    def getVisibleChildrenCount(self, vmid, accessible_context) -> int:
+        self.calls['getVisibleChildrenCount'] += 1
+        return len(self._visible_children(accessible_context))
+
+    def getVisibleChildren(self, vmid, accessible_context, start, info_ref) -> int:
+        self.calls['getVisibleChildren'] += 1
+        info = info_ref._obj
+        children = self._visible_children(accessible_context)[start:start + MAX_VISIBLE_CHILDREN]
+        info.returnedChildrenCount = len(children)
+        for index, child in enumerate(children):
+            info.children[index] = self.handle(child)
+        return 1
+
+    def getObjectDepth(self, vmid, accessible_context) -> int:
+        self.calls['getObjectDepth'] += 1
+        node = self._nodes.get(accessible_context)
+        if node is None or accessible_context in self.released:
+            return -1
+        depth = 0
+        while (parent := self._parent(node)) is not None:
+            if not any(child is node for child in parent['children']):
+                # removed from the tree
+                return -1
+            node = parent
+            depth += 1
+        return depth
+
+    def getAccessibleActions(self, vmid, accessible_context, actions_ref) -> int:
+        self.calls['getAccessibleActions'] += 1
+        actions = actions_ref._obj
+        names = self._nodes[accessible_context]['actions']
+        actions.actionsCount = len(names)
+        for index, name in enumerate(names):
+            actions.actionInfo[index].name = name
+        return 1
+
+    def getAccessibleTextInfo(self, vmid, accessible_context, info_ref, x, y) -> int:
+        self.calls['getAccessibleTextInfo'] += 1
+        info = info_ref._obj
+        # characters are UTF-16 code units
+        info.charCount = len(self._nodes[accessible_context]['text'].encode('utf_16_le')) // 2
+        return 1
+
+    def getAccessibleTextRange(self, vmid, accessible_context, start, end, text, length) -> int:
+        self.calls['getAccessibleTextRange'] += 1
+        data = self._nodes[accessible_context]['text'].encode('utf_16_le')[start * 2:(end + 1) * 2]
+        if len(data) // 2 >= length:
+            return 0
+        memmove(text, data + b'\0\0', len(data) + 2)
+        return 1
+
+    def _table(self, accessible_table) -> Dict:
+        return self._nodes[accessible_table]['table']
+
+    def getAccessibleTableInfo(self, vmid, accessible_context, info_ref) -> int:
+        self.calls['getAccessibleTableInfo'] += 1
+        table = self._nodes[accessible_context]
+        if 'headers' not in table:
+            return 0
+        info = info_ref._obj
+        info.columnCount = len(table['headers'])
+        info.rowCount = len(table['children']) // info.columnCount
+        info.accessibleContext = self.handle(table)
+        info.accessibleTable = self.handle({'table': table})
+        return 1
+
+    def getAccessibleTableColumnHeader(self, vmid, accessible_context, info_ref) -> int:
+        self.calls['getAccessibleTableColumnHeader'] += 1
+        headers = self._nodes[accessible_context]['headers']
+        info = info_ref._obj
+        info.rowCount = 1
+        info.columnCount = len(headers)
+        info.accessibleTable = self.handle({'table': dict(node('table', children=[node('label', header) for header in headers]), headers=headers)})
+        return 1
+
+    def getAccessibleTableCellInfo(self, vmid, accessible_table, row, column, info_ref) -> int:
+        self.calls['getAccessibleTableCellInfo'] += 1
+        table = self._table(accessible_table)
+        index = row * len(table['headers']) + column
+        info = info_ref._obj
+        info.accessibleContext = self.handle(table['children'][index])
+        info.index, info.row, info.column = index, row, column
+        return 1
+
+    def getAccessibleTableRow(self, vmid, accessible_table, index) -> int:
+        self.calls['getAccessibleTableRow'] += 1
+        return index // len(self._table(accessible_table)['headers'])
+
+    def getAccessibleTableColumn(self, vmid, accessible_table, index) -> int:
+        self.calls['getAccessibleTableColumn'] += 1
+        return index % len(self._table(accessible_table)['headers'])
+
+    def isSameObject(self, vmid, accessible_context, other) -> bool:
+        self.calls['isSameObject'] += 1
+        return self._nodes.get(accessible_context) is self._nodes.get(other)
+
+    def releaseJavaObject(self, vmid, java_object) -> None:
+        self.released.append(java_object)
+
+    def setPropertyChangeFP(self, callback) -> None:
+        self.callbacks['setPropertyChangeFP'] = callback
+
+    def setPropertyChildChangeFP(self, callback) -> None:
+        self.callbacks['setPropertyChildChangeFP'] = callback
+
+    def setFocusGainedFP(self, callback) -> None:
+        self.callbacks['setFocusGainedFP'] = callback
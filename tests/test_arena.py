@@ -0,0 +1,61 @@
+import pytest
+from fakes import FakeBridge, node
+from uiinspector.core.pyjab import JElement, JHandleArena
+
+
+@pytest.fixture
+def bridge():
+    return FakeBridge(node('frame', 'root', [node('label', str(i)) for i in range(3)]))
+
+
+def children(bridge):
+    return [JElement(bridge, 1, 1, bridge.getAccessibleChildFromContext(1, bridge.root, i), 1) for i in range(3)]
+
+
+def test_release_in_bulk(bridge):
+    live = JElement.live_handles()
+    elements = children(bridge)
+    with JHandleArena() as arena:
+        for element in elements:
+            arena.adopt(element)
+        assert len(arena) == 3
+    assert sorted(bridge.released) == sorted(element.accessible_context for element in elements)
+    assert JElement.live_handles() == live
+    assert len(arena) == 0
+
+
+def test_adopted_element_is_released_once(bridge):
+    element = children(bridge)[0]
+    with JHandleArena() as arena:
+        arena.adopt(element)
+        # owned by the arena
+        element.release_jabelement()
+        assert bridge.released == []
+    element.release_jabelement()
+    assert bridge.released == [element.accessible_context]
+
+
+def test_promoted_element_releases_itself(bridge):
+    first, second, third = children(bridge)
+    with JHandleArena() as arena:
+        for element in (first, second, third):
+            arena.adopt(element)
+        arena.promote(second)
+    assert second.accessible_context not in bridge.released
+    second.release_jabelement()
+    second.release_jabelement()
+    assert bridge.released.count(second.accessible_context) == 1
+
+
+def test_promote_element_of_other_arena(bridge):
+    element = children(bridge)[0]
+    with JHandleArena() as arena, JHandleArena() as other:
+        arena.adopt(element)
+        other.promote(element)
+    assert bridge.released == [element.accessible_context]
+
+
+def test_null_object_is_not_adopted(bridge):
+    arena = JHandleArena()
+    arena.adopt(JElement(bridge, 1, 1, 0))
+    assert len(arena) == 0
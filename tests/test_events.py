@@ -0,0 +1,104 @@
+import threading
+import time
+import types
+import pytest
+from fakes import FakeBridge, node
+from uiinspector.core.pyjab import JDriverWait, JElement, JEventKind, JEventMonitor, JTimeoutError
+
+
+@pytest.fixture
+def bridge():
+    return FakeBridge(node('frame', 'root', [node('panel', 'panel')]))
+
+
+@pytest.fixture
+def root(bridge):
+    return JElement(bridge, 1, 1, bridge.root)
+
+
+@pytest.fixture
+def monitor(bridge, monkeypatch):
+    monitor = JEventMonitor(bridge)
+    monkeypatch.setattr(JEventMonitor, '_instance', monitor)
+    return monitor
+
+
+def later(action, seconds = 0.05):
+    timer = threading.Timer(seconds, action)
+    timer.start()
+    return timer
+
+
+def test_callbacks_are_registered_while_subscribed(monitor, bridge):
+    assert bridge.callbacks == {}
+    first, second = monitor.subscribe(1), monitor.subscribe(2)
+    assert set(bridge.callbacks) == {'setPropertyChangeFP', 'setPropertyChildChangeFP', 'setFocusGainedFP'}
+    assert all(bridge.callbacks.values())
+    first.close()
+    assert all(bridge.callbacks.values())
+    second.close()
+    assert not any(bridge.callbacks.values())
+
+
+def test_subscriptions_of_the_vm_are_notified(monitor):
+    subscription, other = monitor.subscribe(1), monitor.subscribe(2)
+    monitor._on_property_change(1, 10, 11, 'AccessibleName', 'a', 'b')
+    assert subscription.wait(1)
+    assert not other.wait(0.01)
+
+
+def test_subscriptions_of_the_kind_are_notified(monitor):
+    children = monitor.subscribe(1, kinds=(JEventKind.CHILDREN,))
+    monitor._on_property_change(1, 10, 11, 'AccessibleName', 'a', 'b')
+    assert not children.wait(0.01)
+    monitor._on_property_child_change(1, 10, 11, 0, 12)
+    assert children.wait(1)
+
+
+def test_closed_subscription_is_not_notified(monitor):
+    with monitor.subscribe(1) as subscription:
+        pass
+    monitor._on_focus_gained(1, 10, 11)
+    assert not subscription.wait(0.01)
+
+
+def test_event_objects_are_released(monitor, bridge):
+    monitor._on_property_child_change(1, 10, 11, 0, 13)
+    assert sorted(bridge.released) == [10, 11, 13]
+
+
+def test_subscription_of_a_source(root, bridge, monitor):
+    panel = root.find_element('name', 'panel')
+    subscription = monitor.subscribe(1, source=panel)
+    monitor._on_property_change(1, 10, bridge.handle(bridge.node(bridge.root)), 'AccessibleName', 'a', 'b')
+    assert not subscription.wait(0.01)
+    # the event has its own reference to the panel
+    monitor._on_property_change(1, 10, bridge.handle(bridge.node(panel.accessible_context)), 'AccessibleName', 'a', 'b')
+    assert subscription.wait(1)
+
+
+def test_event_ends_the_wait_of_a_search(root, bridge, monitor):
+    def add_button():
+        bridge.node(bridge.root)['children'][0]['children'].append(node('button', 'ok'))
+        monitor._on_property_child_change(1, 10, 11, 0, 12)
+    started = time.monotonic()
+    later(add_button)
+    found = root.find_element_by_levels([{'name': 'panel'}, {'role': 'button'}], timeout=10, event_driven=True)
+    assert found.name == 'ok'
+    # the fallback check would happen after EVENT_FALLBACK_INTERVAL seconds
+    assert time.monotonic() - started < 1
+
+
+def test_event_driven_driver_wait(monitor):
+    events = []
+    driver = types.SimpleNamespace(vmid=1, event_monitor=monitor)
+    started = time.monotonic()
+    later(lambda: (events.append(1), monitor._on_focus_gained(1, 10, 11)))
+    assert JDriverWait(driver, timeout=10, event_driven=True).until(lambda driver: events)
+    assert time.monotonic() - started < 1
+
+
+def test_event_driven_driver_wait_times_out(monitor):
+    driver = types.SimpleNamespace(vmid=1, event_monitor=monitor)
+    with pytest.raises(JTimeoutError):
+        JDriverWait(driver, timeout=0.1, event_driven=True).until(lambda driver: False)
@@ -0,0 +1,91 @@
+import gc
+import itertools
+import threading
+import time
+import types
+import pytest
+from fakes import FakeBridge, node
+from uiinspector.core.pyjab import JDriver, JElement, JElementNotFoundException
+
+hwnds = itertools.count(100)
+
+
+def window(title, *children, vmid = 1):
+    bridge = FakeBridge(node('frame', title, children))
+    return types.SimpleNamespace(bridge=bridge, root_element=JElement(bridge, next(hwnds), vmid, bridge.root))
+
+
+@pytest.fixture
+def windows(monkeypatch):
+    windows = [
+        window('editor', node('panel', 'tools', [node('button', 'save')])),
+        window('dialog', node('panel', 'buttons', [node('button', 'ok'), node('button', 'cancel')])),
+        window('empty'),
+    ]
+    monkeypatch.setattr(JDriver, 'java_windows', staticmethod(lambda: windows))
+    return windows
+
+
+def test_match_of_any_window(windows):
+    found = JDriver.find_element_in_windows(role='button', name='ok')
+    assert found.name == 'ok'
+    assert found.bridge is windows[1].bridge
+
+
+def test_not_found(windows):
+    with pytest.raises(JElementNotFoundException):
+        JDriver.find_element_in_windows(role='button', name='help')
+
+
+def test_no_java_window(monkeypatch):
+    monkeypatch.setattr(JDriver, 'java_windows', staticmethod(lambda: []))
+    with pytest.raises(JElementNotFoundException):
+        JDriver.find_element_in_windows(role='button')
+
+
+def test_cancelled_search_stops(windows):
+    cancel = threading.Event()
+    cancel.set()
+    assert windows[0].root_element.find_elements('role', 'button', cancel=cancel) == []
+
+
+def test_searches_have_their_own_root(windows):
+    stats = {}
+    with pytest.raises(JElementNotFoundException):
+        JDriver.find_element_in_windows(role='button', name='help', stats=stats)
+    assert all(window.root_element.last_search_stats is None for window in windows)
+    assert all(window.root_element._info is None for window in windows)
+    assert [stats[window.root_element.hwnd].nodes_visited for window in windows] == [2, 3, 0]
+
+
+def test_matches_of_other_windows_are_released(monkeypatch):
+    windows = [window(str(i), node('button', 'ok')) for i in range(4)]
+    monkeypatch.setattr(JDriver, 'java_windows', staticmethod(lambda: windows))
+    gc.collect()
+    live = JElement.live_handles()
+    found = JDriver.find_element_in_windows(role='button')
+    gc.collect()
+    assert JElement.live_handles() == live + 1
+    assert found.accessible_context not in found.bridge.released
+
+
+@pytest.mark.parametrize('vmids, overlap', [((1, 1), False), ((1, 2), True)])
+def test_calls_into_one_vm_are_serialized(monkeypatch, vmids, overlap):
+    windows = [window(str(vmid), *[node('label', str(i)) for i in range(20)], vmid=vmid) for vmid in vmids]
+    monkeypatch.setattr(JDriver, 'java_windows', staticmethod(lambda: windows))
+    running = []
+    overlaps = []
+
+    def slow(get_info):
+        def call(*args):
+            running.append(1)
+            overlaps.append(len(running) > 1)
+            time.sleep(0.002)
+            running.pop()
+            return get_info(*args)
+        return call
+    for window_ in windows:
+        monkeypatch.setattr(window_.bridge, 'getAccessibleContextInfo', slow(window_.bridge.getAccessibleContextInfo))
+    with pytest.raises(JElementNotFoundException):
+        JDriver.find_element_in_windows(role='button')
+    assert any(overlaps) == overlap
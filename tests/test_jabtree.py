@@ -0,0 +1,73 @@
+import pytest
+
+pytest.importorskip('PySide6')
+from fakes import FakeBridge, node, table
+from uiinspector.core.pyjab import JElement
+from uiinspector.core.tree.jabtree import JABTreeItem
+
+
+@pytest.fixture
+def bridge():
+    return FakeBridge(node('frame', 'root', [node('push button', 'ok', actions=['click'])]))
+
+
+@pytest.fixture
+def root(bridge):
+    return JElement(bridge, 1, 1, bridge.root)
+
+
+def test_item_reads_one_snapshot(root, bridge):
+    JABTreeItem(root)
+    assert bridge.calls['getAccessibleContextInfo'] == 1
+
+
+def test_properties_read_one_fresh_snapshot(root, bridge):
+    item = JABTreeItem(root.find_element('name', 'ok'))
+    bridge.node(item.control.accessible_context)['name'] = 'apply'
+    bridge.calls.clear()
+    properties = item.properties
+    assert properties[:2] + properties[4:6] == ['push button', 'apply', 'click', 'enabled, showing']
+    assert bridge.calls['getAccessibleContextInfo'] == 1
+
+
+def test_key_of_control_matches_item_key(root):
+    window = JABTreeItem(root)
+    button = JABTreeItem(root.find_element('name', 'ok'), window)
+    assert JABTreeItem.key_of(button.control, window.key) == button.key
+    assert JABTreeItem.key_of(root) == window.key == ('hwnd', root.hwnd)
+
+
+def test_removed_control_is_not_alive(root, bridge):
+    children = bridge.node(root.accessible_context)['children']
+    children.extend(node('label', str(i)) for i in range(100))
+    item = JABTreeItem(root.find_element('name', 'ok'), JABTreeItem(root))
+    bridge.calls.clear()
+    assert item.is_alive()
+    # the siblings are not listed
+    assert sum(bridge.calls.values()) == 2
+    # the removed control is still readable
+    bridge.node(root.accessible_context)['children'].clear()
+    assert not item.is_alive()
+
+
+def test_key_is_kept_when_a_sibling_is_inserted_before(root, bridge):
+    children = bridge.node(root.accessible_context)['children']
+    children.append(node('push button', 'ok'))
+    second = root.find_element('name', 'ok', search_properties={'found_index': 2})
+    key = JABTreeItem.key_of(second, ('hwnd', 1), 1)
+    assert key != JABTreeItem.key_of(root.find_element('name', 'ok'), ('hwnd', 1), 0)
+    children.insert(0, node('label', 'title'))
+    second = root.find_element('name', 'ok', search_properties={'found_index': 2})
+    assert JABTreeItem.key_of(second, ('hwnd', 1), 1) == key
+
+
+def test_cell_is_keyed_by_position():
+    bridge = FakeBridge(node('frame', 'root', [table('grid', rows=100)]))
+    grid = JElement(bridge, 1, 1, bridge.root).find_element('name', 'grid')
+    cell = grid.get_table_cell(70, 2)
+    cell.context_info()
+    bridge.calls.clear()
+    key = JABTreeItem.key_of(cell, ('hwnd', 1), cell=(70, 2))
+    # the other cells are not read
+    assert sum(bridge.calls.values()) == 0
+    assert key == (('hwnd', 1), (1, 'cell', 70, 2))
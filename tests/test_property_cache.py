@@ -0,0 +1,92 @@
+import pytest
+
+pytest.importorskip('PySide6')
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication, QTableView
+from fakes import FakeBridge, node
+from uiinspector.core import base
+from uiinspector.core.base import UITreeItem
+from uiinspector.core.pyjab import JElement, JEventMonitor
+from uiinspector.core.tree.jabtree import JABTreeItem
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(base, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def bridge():
+    return FakeBridge(node('frame', 'root', [node('label', str(i)) for i in range(3)]))
+
+
+@pytest.fixture
+def monitor(bridge, monkeypatch):
+    monitor = JEventMonitor(bridge)
+    monkeypatch.setattr(JEventMonitor, '_instance', monitor)
+    yield monitor
+    UITreeItem.unwatch_all()
+
+
+@pytest.fixture
+def table(app):
+    return QTableView()
+
+
+def items(bridge):
+    root = JElement(bridge, 1, 1, bridge.root)
+    return [JABTreeItem(child) for child in root._generate_childs_from_element()]
+
+
+def reads(bridge, item, table):
+    bridge.calls.clear()
+    item.update_property_table(table)
+    return bridge.calls['getAccessibleContextInfo']
+
+
+def freshness(table):
+    return table.model().headerData(1, Qt.Horizontal, Qt.DisplayRole)
+
+
+def test_properties_are_cached_for_ttl(bridge, monitor, clock, table):
+    item = items(bridge)[0]
+    assert reads(bridge, item, table)
+    assert freshness(table) == 'Value (just read)'
+    clock.now += item.property_ttl
+    assert reads(bridge, item, table) == 0
+    assert freshness(table) == f'Value (cached {item.property_ttl}s ago)'
+    clock.now += 1
+    assert reads(bridge, item, table) == 1
+
+
+def test_change_event_invalidates_properties(bridge, monitor, clock, table):
+    item = items(bridge)[0]
+    item.update_property_table(table)
+    source = bridge.handle(bridge.node(item.control.accessible_context))
+    monitor._on_property_change(1, bridge.handle({}), source, 'AccessibleName', '0', 'zero')
+    assert reads(bridge, item, table) == 1
+
+
+def test_least_recently_shown_item_is_unwatched(bridge, monitor, clock, table, monkeypatch):
+    monkeypatch.setattr(base, 'MAX_WATCHED_ITEMS', 2)
+    first, second, third = items(bridge)
+    for item in (first, second, third):
+        item.update_property_table(table)
+    assert [item._subscription is not None for item in (first, second, third)] == [False, True, True]
+    # changes of first are not reported anymore
+    assert reads(bridge, first, table) == 1
@@ -0,0 +1,84 @@
+import pytest
+from fakes import FakeBridge, node
+from uiinspector.core.pyjab import JElement, JException, PruneRule, SearchStats
+
+
+@pytest.fixture
+def root():
+    bridge = FakeBridge(node('frame', 'root', [
+        node('tabla', 'table', [node('label', 'cell')], role_en_us='table'),
+        node('list', 'list', [node('label', f'item{i}') for i in range(5)]),
+        node('panel', 'panel', [node('label', 'text')]),
+    ]))
+    return JElement(bridge, 1, 1, bridge.root)
+
+
+def labels(root, prune):
+    return [element.name for element in root._generate_all_childs(prune=prune) if element.role == 'label']
+
+
+def test_roles_prune_children_only(root):
+    assert labels(root, PruneRule(roles=('list',))) == ['cell', 'text']
+    # the pruned element itself is still compared
+    assert root.find_element('role', 'list', prune=PruneRule(roles=('list',))).name == 'list'
+
+
+def test_roles_match_english_role(root):
+    assert labels(root, PruneRule(roles=PruneRule.CONTAINER_ROLES)) == ['text']
+
+
+def test_max_children(root):
+    assert labels(root, PruneRule(max_children=3)) == ['cell', 'text']
+
+
+def test_predicate(root):
+    assert 'text' not in labels(root, PruneRule(predicate=lambda jelement: jelement.name == 'panel'))
+
+
+def test_pruned_elements_are_counted(root):
+    root.find_element('name', 'text', prune=PruneRule(roles=('list',)))
+    assert root.last_search_stats.pruned == 1
+
+
+def test_rule_reads_one_snapshot(root):
+    stats = SearchStats()
+    panel = root.find_element('name', 'panel')
+    PruneRule(roles=('list',), max_children=0)(panel, stats)
+    assert stats.bridge_calls <= 1
+
+
+@pytest.mark.parametrize('value, expected', [
+    (None, None),
+    ({'roles': ('list',)}, "PruneRule(roles=('list',))"),
+    ({'max_children': 10}, 'PruneRule(max_children=10)'),
+])
+def test_from_value(value, expected):
+    rule = PruneRule.from_value(value)
+    assert (repr(rule) if rule else rule) == expected
+
+
+def test_from_predicate():
+    predicate = lambda jelement: True
+    assert PruneRule.from_value(predicate).predicate is predicate
+
+
+def test_from_incorrect_value():
+    with pytest.raises(JException):
+        PruneRule.from_value(3)
+
+
+def test_rule_from_selectors_keeps_containers_on_path():
+    pytest.importorskip('PySide6')
+    from uiinspector.core.tree.jabtree import JABSelectorHelper
+    selectors = ["<java role='frame' name='app' depth=1>", "<java role='table' depth=2>",
+                 "<java role='label' name='cell' row=1 col=2 depth=3>"]
+
+    class SelectorList:
+        def count(self):
+            return len(selectors)
+
+        def item(self, index):
+            return type('Item', (), {'text': lambda self: selectors[index]})()
+
+    window = type('Window', (), {'selector_list': SelectorList()})()
+    assert JABSelectorHelper.prune_rule_from_selectors(window).roles == ('tree', 'list')
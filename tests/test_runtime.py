@@ -0,0 +1,65 @@
+import types
+import pytest
+from fakes import FakeBridge, node
+from uiinspector.core import pyjab
+from uiinspector.core.pyjab import JABRuntime, JDriver
+
+
+@pytest.fixture
+def setup(monkeypatch):
+    """
+    Replace the pyjab services used by JABRuntime, the returned namespace records their calls.
+    """
+    setup = types.SimpleNamespace(loaded=[], fixed=[], started=[], pumps=[], rounds=[], pump_rounds=None)
+    bridge = FakeBridge(node('frame'))
+    bridge.Windows_run = lambda: setup.started.append(bridge)
+
+    def load_library(bridge_dll):
+        setup.loaded.append(bridge_dll)
+        return bridge
+
+    def setup_msg_pump():
+        setup.pumps.append(1)
+        for _ in range(setup.pump_rounds or 1000):
+            setup.rounds.append(1)
+            yield
+
+    monkeypatch.setattr(pyjab, 'Service', lambda: types.SimpleNamespace(load_library=load_library))
+    monkeypatch.setattr(pyjab, 'JABFixedFunc',
+                        lambda bridge: types.SimpleNamespace(_fix_bridge_functions=lambda: setup.fixed.append(bridge)))
+    monkeypatch.setattr(pyjab, 'Win32Utils', lambda: types.SimpleNamespace(setup_msg_pump=setup_msg_pump))
+    monkeypatch.setattr(pyjab, 'Logger', lambda name: None)
+    monkeypatch.setattr(JABRuntime, '_instance', None)
+    return setup
+
+
+def test_bridge_is_loaded_once(setup):
+    runtime = JABRuntime.instance('bridge.dll')
+    assert JABRuntime.instance() is runtime
+    assert setup.loaded == ['bridge.dll']
+    assert setup.started == setup.fixed == [runtime.bridge]
+
+
+def test_message_pump_is_reused(setup):
+    runtime = JABRuntime.instance()
+    runtime.pump_messages()
+    runtime.pump_messages()
+    assert len(setup.pumps) == 1
+    # the first round is run when the bridge is started
+    assert len(setup.rounds) == 3
+
+
+def test_message_pump_is_created_again_after_quit(setup):
+    setup.pump_rounds = 1
+    runtime = JABRuntime.instance()
+    runtime.pump_messages()
+    runtime.pump_messages()
+    assert len(setup.pumps) == 2
+
+
+def test_driver_does_not_fix_bridge_again(setup, monkeypatch):
+    monkeypatch.setattr(JDriver, 'init_jab', lambda self: setattr(self, '_bridge', self.runtime.bridge))
+    runtime = JABRuntime.instance()
+    JDriver(hwnd=1)
+    JDriver(hwnd=2)
+    assert setup.fixed == [runtime.bridge]
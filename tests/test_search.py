@@ -0,0 +1,175 @@
+import pytest
+from fakes import FakeBridge, node
+from uiinspector.core.pyjab import JElement, JElementNotFoundException
+
+
+@pytest.fixture
+def bridge():
+    return FakeBridge(node('frame', 'root', [
+        node('panel', 'a', [
+            node('label', 'a1', [node('label', 'a11')]),
+            node('label', 'a2'),
+        ]),
+        node('panel', 'b', [node('label', 'b1')]),
+        node('label', 'c', states='enabled'),
+    ]))
+
+
+@pytest.fixture
+def root(bridge):
+    return JElement(bridge, 1, 1, bridge.root)
+
+
+def test_each_node_info_is_read_once(root, bridge):
+    with pytest.raises(JElementNotFoundException):
+        root.find_element(search_properties={'role': 'label', 'name': 'x', 'states': 'enabled', 'index_in_parent': 0})
+    # the search root and its 7 descendants
+    assert bridge.calls['getAccessibleContextInfo'] == 8
+    assert root.last_search_stats.nodes_visited == 7
+    assert root.last_search_stats.bridge_calls == sum(bridge.calls.values())
+
+
+def test_properties_are_compared_on_one_snapshot(root):
+    found = root.find_element(search_properties={'role': 'label', 'states': 'showing,enabled', 'index_in_parent': 1})
+    assert found.name == 'a2'
+
+
+def test_found_index(root):
+    assert root.find_element(search_properties={'role': 'label', 'found_index': 3}).name == 'a2'
+
+
+def test_context_info_is_shared_until_refreshed(root, bridge):
+    info = root.context_info()
+    bridge.node(root.accessible_context)['name'] = 'renamed'
+    assert root.context_info() is info
+    assert root.context_info(refresh=True).name == 'renamed'
+
+
+def test_search_finds_children_added_to_root(root, bridge):
+    root.context_info()
+    bridge.node(root.accessible_context)['children'].append(node('button', 'd'))
+    assert root.find_element('role', 'button').name == 'd'
+
+
+class Clock:
+    """
+    Replace the time module of pyjab, on_sleep is called by every sleep to change the tree between retries.
+    Every reading of the clock takes a millisecond.
+    """
+    def __init__(self, on_sleep):
+        self.now = 1000.0
+        self.on_sleep = on_sleep
+
+    def time(self):
+        self.now += 0.001
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        self.on_sleep()
+
+
+@pytest.fixture
+def retry(monkeypatch):
+    from uiinspector.core import pyjab
+
+    def install(on_sleep):
+        monkeypatch.setattr(pyjab, 'time', Clock(on_sleep))
+    return install
+
+
+LEVELS = [{'role': 'panel', 'name': 'b'}, {'role': 'button', 'name': 'ok'}]
+
+
+@pytest.mark.parametrize('resume, infos', [(True, 4), (False, 9)])
+def test_resumed_retry_searches_below_anchor(root, bridge, retry, resume, infos):
+    panel = bridge.node(root.accessible_context)['children'][1]
+    calls = []
+
+    def add_button():
+        calls.append(bridge.calls['getAccessibleContextInfo'])
+        panel['children'].append(node('button', 'ok'))
+    retry(add_button)
+    found = root.find_element_by_levels(LEVELS, timeout=1, resume=resume)
+    assert bridge.calls['getAccessibleContextInfo'] - calls[0] == infos
+    assert found.name == 'ok'
+
+
+def test_detached_anchor_is_searched_again(root, bridge, retry):
+    children = bridge.node(root.accessible_context)['children']
+    replacement = node('panel', 'b', [node('button', 'ok')])
+
+    def replace_panel():
+        children[1] = replacement
+    retry(replace_panel)
+    found = root.find_element_by_levels(LEVELS, timeout=1, resume=True)
+    assert bridge.node(found.accessible_context) is replacement['children'][0]
+
+
+def test_anchor_no_longer_matching_is_searched_again(root, bridge, retry):
+    children = bridge.node(root.accessible_context)['children']
+
+    def rename_panel():
+        children[1]['name'] = 'old'
+        children.append(node('panel', 'b', [node('button', 'ok')]))
+    retry(rename_panel)
+    found = root.find_element_by_levels(LEVELS, timeout=1, resume=True)
+    assert bridge.node(found.accessible_context) is children[-1]['children'][0]
+
+
+def test_anchor_at_found_index_is_searched_again(root, bridge, retry):
+    children = bridge.node(root.accessible_context)['children']
+    levels = [{'role': 'panel', 'found_index': 2}, {'role': 'button', 'name': 'ok'}]
+
+    def insert_panel():
+        if len(children) == 3:
+            # the first panel found is now 'new', the second one 'a'
+            children.insert(0, node('panel', 'new'))
+        else:
+            children[0]['children'].append(node('button', 'ok'))
+            children[1]['children'].append(node('button', 'ok'))
+    retry(insert_panel)
+    found = root.find_element_by_levels(levels, timeout=1, resume=True)
+    assert bridge.node(found.accessible_context) is children[1]['children'][-1]
+
+
+def test_timeout_raises_last_error(root, retry):
+    retry(lambda: None)
+    with pytest.raises(JElementNotFoundException):
+        root.find_element_by_levels(LEVELS, timeout=1, resume=True)
+
+
+def names(elements):
+    return [element.name for element in elements]
+
+
+def test_find_elements_in_one_traversal(root, bridge):
+    assert names(root.find_elements('role', 'label')) == ['a1', 'a11', 'a2', 'b1', 'c']
+    assert root.last_search_stats.nodes_visited == 7
+
+
+@pytest.mark.parametrize('kwargs, expected', [
+    ({'start': 2}, ['a11', 'a2', 'b1', 'c']),
+    ({'start': 2, 'stop': 4}, ['a11', 'a2']),
+    ({'limit': 2}, ['a1', 'a11']),
+    ({'start': 3, 'limit': 1}, ['a2']),
+    ({'search_properties': {'found_index': 4}, 'limit': 1}, ['b1']),
+    ({'stop': 1}, []),
+    ({'limit': 0}, []),
+])
+def test_range_of_matches(root, kwargs, expected):
+    assert names(root.find_elements('role', 'label', **kwargs)) == expected
+
+
+def test_iter_elements_is_lazy(root):
+    elements = root.iter_elements('role', 'label')
+    assert next(elements).name == 'a1'
+    assert root.last_search_stats.nodes_visited == 2
+    elements.close()
+
+
+def test_role_matches_localized_or_english():
+    bridge = FakeBridge(node('frame', 'root', [node('Schaltfläche', 'ok', role_en_us='push button')]))
+    root = JElement(bridge, 1, 1, bridge.root)
+    assert root.find_element('role', 'push button').name == 'ok'
+    assert root.find_element('role', 'Schaltfläche').name == 'ok'
@@ -0,0 +1,88 @@
+import pytest
+
+pytest.importorskip('PySide6')
+from uiinspector.core.base import TreeSearchIndex
+
+
+class Item:
+    def __init__(self, *search_terms):
+        self.search_terms = search_terms
+
+
+@pytest.fixture
+def items():
+    return {
+        'ok': Item('Button', 'OK_Cancel'),
+        'user': Item('Edit', 'User name', 'userNameField'),
+        'xml': Item('Document', 'XMLHttpRequest'),
+        'umlaut': Item('Pane', 'Über'),
+        'empty': Item('Pane', None, ''),
+    }
+
+
+@pytest.fixture
+def index(items):
+    index = TreeSearchIndex()
+    for item in items.values():
+        index.add(item)
+    return index
+
+
+def found(index, items, query):
+    results = index.search(query)
+    return sorted(name for name, item in items.items() if item in results)
+
+
+@pytest.mark.parametrize('text, words', [
+    ('OK_Cancel', ['ok', 'cancel']),
+    ('okCancel', ['ok', 'cancel']),
+    ('XMLHttpRequest', ['xml', 'http', 'request']),
+    ('Button2', ['button', '2']),
+    ('save (Ctrl+S)', ['save', 'ctrl', 's']),
+    ('Über Fenster', ['über', 'fenster']),
+    ('', []),
+])
+def test_split(text, words):
+    assert TreeSearchIndex.split(text) == words
+
+
+@pytest.mark.parametrize('query, names', [
+    ('cancel', ['ok']),
+    ('okcan', ['ok']),
+    ('ok_can', ['ok']),
+    ('OK cancel', ['ok']),
+    ('name field', ['user']),
+    ('NameF', ['user']),
+    ('username', ['user']),
+    ('pane', ['empty', 'umlaut']),
+    ('http', ['xml']),
+    ('über', ['umlaut']),
+    ('cancel edit', []),
+    ('', []),
+])
+def test_search(index, items, query, names):
+    assert found(index, items, query) == names
+
+
+def test_limit(index):
+    assert len(index.search('pane', limit=1)) == 1
+
+
+def test_add_again_replaces_words(index, items):
+    items['ok'].search_terms = ('Button', 'Apply')
+    index.add(items['ok'])
+    assert found(index, items, 'cancel') == []
+    assert found(index, items, 'apply') == ['ok']
+    assert len(index) == len(items)
+
+
+def test_remove(index, items):
+    index.remove(items['ok'])
+    assert found(index, items, 'button') == []
+    assert len(index) == len(items) - 1
+
+
+def test_clear(index, items):
+    index.clear()
+    assert index.search('pane') == []
+    assert len(index) == 0
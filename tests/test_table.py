@@ -0,0 +1,91 @@
+import pytest
+from fakes import FakeBridge, node, table
+from uiinspector.core.pyjab import JElement, JElementNotFoundException, SearchStats
+
+
+@pytest.fixture
+def bridge():
+    return FakeBridge(node('frame', 'root', [
+        node('label', 'title'),
+        table('grid', rows=100),
+    ]))
+
+
+@pytest.fixture
+def grid(bridge):
+    root = JElement(bridge, 1, 1, bridge.root)
+    return root.find_element('name', 'grid')
+
+
+def test_cell_is_addressed_without_enumerating_cells(grid, bridge):
+    bridge.calls.clear()
+    stats = SearchStats()
+    assert grid.get_table_cell(70, 2, stats=stats).name == '70:2'
+    assert bridge.calls['getAccessibleChildFromContext'] == 0
+    # table info and cell info, the name is read by the assertion
+    assert stats.bridge_calls == 2
+
+
+def test_cell_by_header(grid):
+    assert grid.get_table_cell(3, header='B').name == '3:1'
+
+
+def test_unknown_header(grid):
+    with pytest.raises(JElementNotFoundException):
+        grid.get_table_cell(3, header='D')
+
+
+@pytest.mark.parametrize('row, column', [(100, 0), (0, 3), (-1, 0)])
+def test_cell_out_of_range(grid, row, column):
+    with pytest.raises(JElementNotFoundException):
+        grid.get_table_cell(row, column)
+
+
+def test_table_info_is_released(grid, bridge):
+    bridge.released.clear()
+    grid.get_table_cell(1, 1)
+    # the table context and the accessible table
+    assert len(bridge.released) == 2
+
+
+def test_search_from_table_addresses_cell(grid, bridge):
+    bridge.calls.clear()
+    assert grid.find_element(search_properties={'row': 99, 'column': 0}).name == '99:0'
+    assert bridge.calls['getAccessibleChildFromContext'] == 0
+    assert grid.last_search_stats.nodes_visited == 1
+
+
+def test_search_from_table_compares_other_properties(grid):
+    with pytest.raises(JElementNotFoundException):
+        grid.find_element(search_properties={'row': 1, 'column': 1, 'name': '1:2'})
+
+
+def test_cell_position(grid):
+    cell = grid.get_table_cell(42, 1)
+    assert grid.get_table_cell_position(cell) == (42, 1)
+
+
+@pytest.mark.parametrize('properties, name', [
+    ({'role': 'label', 'row': 5, 'column': 2}, '5:2'),
+    ({'row': 7}, '7:0'),
+    ({'role': 'label', 'column': 1}, '0:1'),
+])
+def test_search_by_cell_position_outside_table(bridge, properties, name):
+    root = JElement(bridge, 1, 1, bridge.root)
+    assert root.find_element(search_properties=properties).name == name
+
+
+def test_cell_position_does_not_match_other_elements(bridge):
+    root = JElement(bridge, 1, 1, bridge.root)
+    with pytest.raises(JElementNotFoundException):
+        root.find_element(search_properties={'name': 'title', 'row': 0})
+
+
+def test_cell_positions_read_table_info_once(grid, bridge):
+    cells = list(grid._generate_childs_from_element())[:5]
+    bridge.calls.clear()
+    bridge.released.clear()
+    positions = [position for _, position in grid.iter_table_cell_positions(cells)]
+    assert positions == [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1)]
+    assert bridge.calls['getAccessibleTableInfo'] == 1
+    assert len(bridge.released) == 2
@@ -0,0 +1,97 @@
+import threading
+import time
+import pytest
+from fakes import FakeBridge, node
+from uiinspector.core import pyjab
+from uiinspector.core.pyjab import JElement, JEventMonitor, JException
+
+
+class Clock:
+    """
+    Replace the time module of pyjab, every sleep takes the next text of the element.
+    """
+    def __init__(self, element, texts):
+        self.element = element
+        self.texts = iter(texts)
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        self.element.bridge.node(self.element.accessible_context)['text'] = next(self.texts)
+
+
+def text_element(text):
+    bridge = FakeBridge(node('text', 'log', text=text))
+    return JElement(bridge, 1, 1, bridge.root)
+
+
+def test_chunks():
+    text = ''.join(chr(ord('a') + i % 26) for i in range(20000))
+    element = text_element(text)
+    chunks = list(element.iter_text(chunk_size=8192))
+    assert [len(chunk) for chunk in chunks] == [8192, 8192, 3616]
+    assert ''.join(chunks) == text
+    assert element.bridge.calls['getAccessibleTextRange'] == 3
+
+
+def test_chunk_size_is_capped():
+    element = text_element('x' * 40000)
+    assert max(len(chunk) for chunk in element.iter_text(chunk_size=100000)) == pyjab.MAX_TEXT_CHUNK_SIZE
+
+
+def test_start_offset():
+    assert ''.join(text_element('hello world').iter_text(start=6)) == 'world'
+
+
+def test_character_split_between_ranges():
+    text = 'ab\U0001F600cd\U0001F600'
+    assert ''.join(text_element(text).iter_text(chunk_size=3)) == text
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 100])
+def test_lines(chunk_size):
+    assert list(text_element('a\nbb\n\nccc').iter_text(chunk_size=chunk_size, lines=True)) == ['a\n', 'bb\n', '\n', 'ccc']
+
+
+def test_element_without_text():
+    bridge = FakeBridge(node('panel'))
+    with pytest.raises(JException):
+        next(JElement(bridge, 1, 1, bridge.root).iter_text())
+
+
+def test_tail_reads_appended_text(monkeypatch):
+    element = text_element('one\n')
+    monkeypatch.setattr(pyjab, 'time', Clock(element, ['one\n', 'one\ntw', 'one\ntwo\nthree\n']))
+    reader = element.iter_text(lines=True, tail=True)
+    assert [next(reader) for _ in range(3)] == ['one\n', 'two\n', 'three\n']
+    reader.close()
+
+
+def test_tail_starts_over_when_text_is_shorter(monkeypatch):
+    element = text_element('first line\n')
+    monkeypatch.setattr(pyjab, 'time', Clock(element, ['new\n']))
+    reader = element.iter_text(lines=True, tail=True)
+    assert [next(reader) for _ in range(2)] == ['first line\n', 'new\n']
+    reader.close()
+
+
+def test_event_driven_tail(monkeypatch):
+    element = text_element('one\n')
+    bridge = element.bridge
+    monitor = JEventMonitor(bridge)
+    monkeypatch.setattr(JEventMonitor, '_instance', monitor)
+
+    def append():
+        text = bridge.node(bridge.root)
+        text['text'] += 'two\n'
+        monitor._on_property_change(1, bridge.handle({}), bridge.handle(text), 'AccessibleText', '', '')
+    reader = element.iter_text(lines=True, tail=True, poll_frequency=10, event_driven=True)
+    assert next(reader) == 'one\n'
+    started = time.monotonic()
+    threading.Timer(0.05, append).start()
+    assert next(reader) == 'two\n'
+    assert time.monotonic() - started < 1
+    reader.close()
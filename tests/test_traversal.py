@@ -0,0 +1,150 @@
+import gc
+import pytest
+from fakes import FakeBridge, node
+from uiinspector.core.pyjab import JElement, JException, JHandleArena, SearchStats, TraversalStrategy
+
+
+@pytest.fixture
+def bridge():
+    return FakeBridge(node('frame', 'root', [
+        node('panel', 'a', [
+            node('label', 'a1', [node('label', 'a11')]),
+            node('label', 'a2'),
+        ]),
+        node('panel', 'b', [node('label', 'b1')]),
+        node('label', 'c', states='enabled'),
+    ]))
+
+
+@pytest.fixture
+def root(bridge):
+    return JElement(bridge, 1, 1, bridge.root)
+
+
+def names(elements):
+    return [element.name for element in elements]
+
+
+def test_depth_first_visits_pre_order(root):
+    assert names(root._generate_all_childs(strategy=TraversalStrategy.DFS)) == ['a', 'a1', 'a11', 'a2', 'b', 'b1', 'c']
+
+
+def test_breadth_first_visits_level_order(root):
+    assert names(root._generate_all_childs(strategy=TraversalStrategy.BFS)) == ['a', 'b', 'c', 'a1', 'a2', 'b1', 'a11']
+
+
+def test_iterative_deepening_visits_level_order(root):
+    assert names(root._generate_all_childs(strategy=TraversalStrategy.IDDFS)) == ['a', 'b', 'c', 'a1', 'a2', 'b1', 'a11']
+
+
+@pytest.mark.parametrize('strategy', [TraversalStrategy.DFS, TraversalStrategy.BFS, TraversalStrategy.IDDFS])
+def test_max_depth_limits_descendants(root, strategy):
+    assert sorted(names(root._generate_all_childs(max_depth=1, strategy=strategy))) == ['a', 'b', 'c']
+
+
+@pytest.mark.parametrize('strategy', [TraversalStrategy.DFS, TraversalStrategy.BFS, TraversalStrategy.IDDFS])
+def test_visible_skips_hidden_children(root, strategy):
+    assert 'c' not in names(root._generate_all_childs(visible=True, strategy=strategy))
+
+
+def test_depth_of_descendants(root):
+    assert {element.name: element.depth for element in root._generate_all_childs()}['a11'] == 3
+
+
+def test_unknown_strategy(root):
+    with pytest.raises(JException):
+        list(root._generate_all_childs(strategy='random'))
+
+
+@pytest.mark.parametrize('strategy, name', [
+    (TraversalStrategy.DFS, 'a11'),
+    (TraversalStrategy.BFS, 'a1'),
+    (TraversalStrategy.IDDFS, 'a1'),
+])
+def test_found_index_in_strategy_order(root, strategy, name):
+    assert root.find_element('role', 'label', search_properties={'found_index': 2}, strategy=strategy).name == name
+
+
+@pytest.mark.parametrize('strategy', [TraversalStrategy.DFS, TraversalStrategy.BFS])
+def test_deep_tree_does_not_recurse(strategy):
+    leaf = node('label', 'leaf')
+    tree = leaf
+    for _ in range(3000):
+        tree = node('panel', children=[tree])
+    bridge = FakeBridge(tree)
+    assert JElement(bridge, 1, 1, bridge.root).find_element('name', 'leaf', strategy=strategy).depth == 3000
+
+
+@pytest.mark.parametrize('strategy', [TraversalStrategy.DFS, TraversalStrategy.BFS, TraversalStrategy.IDDFS])
+def test_find_elements_in_strategy_order(root, strategy):
+    expected = names(element for element in root._generate_all_childs(strategy=strategy) if element.role == 'label')
+    assert names(root.find_elements('role', 'label', strategy=strategy)) == expected
+
+
+def test_search_releases_handles_not_returned(root, bridge):
+    gc.collect()
+    live = JElement.live_handles()
+    found = root.find_element(search_properties={'name': 'b1'})
+    assert JElement.live_handles() == live + 1
+    assert found.accessible_context not in bridge.released
+
+
+def test_iterative_deepening_releases_each_pass(root):
+    arena = JHandleArena()
+    gc.collect()
+    live = JElement.live_handles()
+    peak = 0
+    for _ in root._generate_all_childs(strategy=TraversalStrategy.IDDFS, arena=arena):
+        peak = max(peak, JElement.live_handles() - live)
+    arena.release()
+    # the last pass holds the whole tree, earlier passes are released
+    assert peak <= 7
+
+
+@pytest.fixture
+def long_list():
+    items = [node('label', str(i), states='enabled' if i % 4 == 3 else 'enabled,showing') for i in range(800)]
+    bridge = FakeBridge(node('frame', 'root', [node('list', 'items', items)]))
+    return JElement(bridge, 1, 1, bridge.root).find_element('role', 'list')
+
+
+def test_visible_children_are_paged(long_list):
+    stats = SearchStats()
+    children = list(long_list._generate_childs_from_element(visible=True, stats=stats))
+    assert len(children) == 600
+    assert names(children[254:258]) == ['338', '340', '341', '342']
+    assert stats.visible_pages == 3
+
+
+def test_visible_page_is_not_fetched_again(long_list):
+    bridge = long_list.bridge
+    bridge.calls.clear()
+    children = list(long_list._generate_childs_from_element(visible=True))
+    assert len(children) == 600
+    assert bridge.calls['getVisibleChildren'] == 3
+    # every returned reference is generated, none is released to be fetched again
+    assert not set(bridge.released) & {child.accessible_context for child in children}
+
+
+def test_visible_search_beyond_first_page(long_list):
+    assert long_list.find_element('name', '798', visible=True).name == '798'
+
+
+def test_children_count_is_refreshed(root, bridge):
+    panel = root.find_element('name', 'b')
+    bridge.node(panel.accessible_context)['children'].append(node('label', 'b2'))
+    assert names(panel._generate_childs_from_element()) == ['b1', 'b2']
+
+
+def test_removed_child_is_skipped(root, bridge, monkeypatch):
+    panel = root.find_element('name', 'a')
+    children = bridge.node(panel.accessible_context)['children']
+    get_child = bridge.getAccessibleChildFromContext
+
+    def remove_last_child(vmid, ac, index):
+        if index == 0:
+            # removed after the children were counted
+            children.pop()
+        return get_child(vmid, ac, index)
+    monkeypatch.setattr(bridge, 'getAccessibleChildFromContext', remove_last_child)
+    assert names(panel._generate_childs_from_element()) == ['a1']
@@ -0,0 +1,204 @@
+import pytest
+
+pytest.importorskip('PySide6')
+from PySide6.QtCore import QCoreApplication, Qt, qInstallMessageHandler
+from PySide6.QtTest import QAbstractItemModelTester
+from uiinspector.core.base import LoadingPlaceholder, UITreeItem, UITreeModel
+
+
+class Item(UITreeItem):
+    __slots__ = ('_key', '_name')
+
+    def __init__(self, parent, key, name = ''):
+        super().__init__(parent, f'{key} {name}'.strip())
+        self._key = key
+        self._name = name
+
+    @property
+    def key(self):
+        return self._key
+
+    @property
+    def search_terms(self):
+        return (self._label, self._name)
+
+    def update_from(self, other):
+        self._name = other._name
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def fetched():
+    return []
+
+
+@pytest.fixture
+def model(app, fetched):
+    model = UITreeModel(fetched.append)
+    messages = []
+    previous = qInstallMessageHandler(lambda mode, context, message: messages.append(message))
+    # checks the consistency of the rows signals with the data of the model
+    tester = QAbstractItemModelTester(model, QAbstractItemModelTester.FailureReportingMode.Warning)
+    yield model
+    qInstallMessageHandler(previous)
+    del tester
+    assert messages == []
+
+
+@pytest.fixture
+def root(model):
+    root = Item(None, 'root')
+    model.set_roots([root])
+    return root
+
+
+def labels(model, item):
+    parent = model.index_of(item)
+    return [model.index(row, 0, parent).data() for row in range(model.rowCount(parent))]
+
+
+def test_children_are_fetched_on_demand(model, root, fetched):
+    index = model.index_of(root)
+    assert model.hasChildren(index)
+    assert model.canFetchMore(index)
+    # the model tester fetches too
+    fetched.clear()
+    model.fetchMore(index)
+    assert fetched == [root]
+
+
+def test_placeholder_is_last_row_while_loading(model, root):
+    model.set_loading(root, True)
+    assert not model.canFetchMore(model.index_of(root))
+    model.insert_children(root, [Item(root, 'a'), Item(root, 'b')])
+    assert labels(model, root) == ['a', 'b', LoadingPlaceholder.loading_label]
+    placeholder = model.item(model.index(2, 0, model.index_of(root)))
+    assert isinstance(placeholder, LoadingPlaceholder)
+    assert not model.flags(model.index_of(placeholder))
+    model.insert_children(root, [Item(root, 'c')])
+    model.set_loading(root, False)
+    model.set_fetched(root)
+    assert labels(model, root) == ['a', 'b', 'c']
+    assert model.parent(model.index_of(root.child(2))) == model.index_of(root)
+    assert not model.canFetchMore(model.index_of(root))
+
+
+def test_fetched_item_without_children_loses_indicator(model, root):
+    model.set_fetched(root)
+    assert not model.hasChildren(model.index_of(root))
+
+
+def test_cleared_children_are_fetched_again(model, root):
+    model.insert_children(root, [Item(root, 'a')])
+    model.set_fetched(root)
+    model.clear_children(root)
+    assert root.childCount() == 0
+    assert model.canFetchMore(model.index_of(root))
+
+
+def keys(item):
+    return ''.join(child.key for child in item.children())
+
+
+@pytest.mark.parametrize('new_keys', ['abcde', 'ace', 'xabcdey', 'edcba', 'cxa', '', 'bdafz'])
+def test_sync_children(model, root, new_keys):
+    model.insert_children(root, [Item(root, key) for key in 'abcde'])
+    model.set_fetched(root)
+    before = {child.key: child for child in root.children()}
+    children = [before.get(key) or Item(root, key) for key in new_keys]
+    model.sync_children(root, children)
+    assert keys(root) == new_keys
+    assert all(child._row == row for row, child in enumerate(root.children()))
+    # kept children are moved, not replaced
+    assert all(child is before.get(child.key, child) for child in children)
+    for key in set(before) | set(new_keys):
+        item = model.find_item(key)
+        assert (item is not None) == (key in new_keys)
+        assert (item in model.search_index.search(key)) == (key in new_keys)
+
+
+def test_moved_item_keeps_its_children(model, root):
+    model.insert_children(root, [Item(root, key) for key in 'abcde'])
+    e = root.child(4)
+    model.insert_children(e, [Item(e, 'e1')])
+    model.sync_children(root, [e] + root.children()[:4])
+    assert keys(root) == 'eabcd'
+    assert model.index_of(e.child(0)).parent().row() == 0
+
+
+def test_contains_only_items_in_the_tree(model, root):
+    model.insert_children(root, [Item(root, key) for key in 'ab'])
+    a, b = root.children()
+    model.insert_children(a, [Item(a, 'a1')])
+    a1 = a.child(0)
+    model.sync_children(root, [b])
+    assert model.contains(b)
+    assert not model.contains(a)
+    assert not model.contains(a1)
+    assert not model.contains(Item(None, 'other'))
+
+
+def test_removed_subtree_is_unindexed(model, root):
+    model.insert_children(root, [Item(root, key) for key in 'ab'])
+    a, b = root.children()
+    model.insert_children(a, [Item(a, 'a1')])
+    assert model.find_item('a1') is a.child(0)
+    model.sync_children(root, [b])
+    assert model.find_item('a1') is None
+    assert model.search_index.search('a1') == []
+
+
+def test_clear_children_unindexes_them(model, root):
+    model.insert_children(root, [Item(root, 'a')])
+    model.clear_children(root)
+    assert model.find_item('a') is None
+    assert model.find_item('root') is root
+
+
+def test_new_label_is_searched(model, root):
+    model.set_label(root, 'renamed')
+    assert model.search_index.search('renamed') == [root]
+    assert model.search_index.search('root') == []
+
+
+def test_update_item_takes_new_label(model, root):
+    model.insert_children(root, [Item(root, 'a')])
+    changed = []
+    model.dataChanged.connect(lambda first, last, roles: changed.append(model.item(first)))
+    item = root.child(0)
+    model.update_item(item, Item(root, 'a', 'renamed'))
+    assert item.label == 'a renamed'
+    assert changed == [item]
+    assert model.search_index.search('renamed') == [item]
+    assert model.data(model.index_of(item), Qt.DisplayRole) == 'a renamed'
+
+
+def test_update_item_reindexes_search_terms(model, root):
+    model.insert_children(root, [Item(root, 'a', 'old')])
+    item = root.child(0)
+    other = Item(root, 'a', 'new')
+    # same label, other search terms
+    model.set_label(item, 'a')
+    other._label = 'a'
+    model.update_item(item, other)
+    assert model.search_index.search('old') == []
+    assert model.search_index.search('new') == [item]
+
+
+def test_failed_loading_shows_error_until_cleared(model, root):
+    model.set_loading(root, True)
+    model.insert_children(root, [Item(root, 'a')])
+    model.set_load_error(root, 'bridge error')
+    # partly loaded children are removed, the item is not fetched
+    assert labels(model, root) == ['Loading failed: bridge error']
+    assert root.load_error == 'bridge error'
+    assert model.find_item('a') is None
+    assert not root.fetched
+    assert not model.canFetchMore(model.index_of(root))
+    model.clear_children(root)
+    assert root.load_error is None
+    assert model.canFetchMore(model.index_of(root))
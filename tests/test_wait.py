@@ -0,0 +1,124 @@
+import pytest
+from uiinspector.core import pyjab
+from uiinspector.core.pyjab import JElementNotFoundException, JTimeoutError, wait_until
+
+
+class Clock:
+    """
+    Replace the time module of pyjab, sleeping advances the clock.
+    """
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 3))
+        self.now += seconds
+
+
+class Subscription:
+    """
+    Event subscription whose events arrive every interval seconds.
+    """
+    def __init__(self, clock, interval):
+        self.clock = clock
+        self.interval = interval
+        self.waits = []
+
+    def wait(self, timeout):
+        self.waits.append(round(timeout, 3))
+        if self.interval is not None and self.interval <= timeout:
+            self.clock.now += self.interval
+            return True
+        self.clock.now += timeout
+        return False
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(pyjab, 'time', clock)
+    return clock
+
+
+def counting(results):
+    calls = []
+
+    def condition():
+        calls.append(len(calls))
+        result = results[len(calls) - 1] if len(calls) <= len(results) else results[-1]
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return condition, calls
+
+
+def test_returns_truthy_result(clock):
+    condition, calls = counting([None, 0, 'found'])
+    assert wait_until(condition, 10) == 'found'
+    assert len(calls) == 3
+
+
+def test_backoff_up_to_max_interval(clock):
+    condition, _ = counting([False])
+    with pytest.raises(JTimeoutError):
+        wait_until(condition, 2, interval=0.1, max_interval=0.5, backoff=2)
+    assert clock.sleeps[:5] == [0.1, 0.2, 0.4, 0.5, 0.5]
+
+
+def test_last_wait_ends_at_timeout(clock):
+    condition, calls = counting([False])
+    with pytest.raises(JTimeoutError):
+        wait_until(condition, 1, interval=0.3, max_interval=0.3, backoff=1)
+    assert clock.now == pytest.approx(1001)
+    assert len(calls) == 5
+
+
+def test_timeout_message(clock):
+    condition, _ = counting([False])
+    with pytest.raises(JTimeoutError, match='still hidden'):
+        wait_until(condition, 1, message='still hidden')
+
+
+def test_ignored_exceptions_are_retried(clock):
+    condition, _ = counting([JElementNotFoundException('missing'), 'found'])
+    assert wait_until(condition, 1, ignored_exceptions=(JElementNotFoundException,)) == 'found'
+
+
+def test_other_exceptions_are_raised(clock):
+    condition, _ = counting([ValueError('broken')])
+    with pytest.raises(ValueError):
+        wait_until(condition, 1, ignored_exceptions=(JElementNotFoundException,))
+
+
+def test_reraise_last_ignored_exception(clock):
+    condition, _ = counting([JElementNotFoundException('missing')])
+    with pytest.raises(JElementNotFoundException, match='missing'):
+        wait_until(condition, 1, ignored_exceptions=(JElementNotFoundException,), reraise=True)
+
+
+def test_event_ends_the_wait(clock):
+    condition, calls = counting([False, False, True])
+    subscription = Subscription(clock, interval=0.2)
+    assert wait_until(condition, 10, interval=5, max_interval=5, subscription=subscription, min_interval=0.1)
+    assert clock.now == pytest.approx(1000.4)
+
+
+def test_events_are_throttled_by_min_interval(clock):
+    condition, calls = counting([False])
+    subscription = Subscription(clock, interval=0.01)
+    with pytest.raises(JTimeoutError):
+        wait_until(condition, 1, interval=5, max_interval=5, subscription=subscription, min_interval=0.25)
+    assert len(calls) == 5
+
+
+def test_wait_without_event_falls_back_to_interval(clock):
+    condition, calls = counting([False])
+    subscription = Subscription(clock, interval=None)
+    with pytest.raises(JTimeoutError):
+        wait_until(condition, 3, interval=1, max_interval=1, subscription=subscription)
+    assert subscription.waits == [1, 1, 1]
+    assert len(calls) == 4
@@ -0,0 +1,113 @@
+import types
+from fnmatch import fnmatch
+import pytest
+from uiinspector.core import pyjab
+from uiinspector.core.pyjab import JWindowCache, JWindowKind
+
+
+class Windows:
+    """
+    Top level windows by hwnd, each one has a process id and is a java window or not.
+    """
+    def __init__(self):
+        self.pids = {}
+        self.java = set()
+        self.failing = set()
+        self.drivers = []
+        self.titles = {}
+
+    def add(self, hwnd, pid, java = True, title = ''):
+        self.pids[hwnd] = pid
+        self.titles[hwnd] = title
+        if java:
+            self.java.add(hwnd)
+
+    def driver(self, hwnd):
+        if hwnd in self.failing:
+            raise RuntimeError(f'HWND:{hwnd} is not ready')
+        driver = types.SimpleNamespace(hwnd=hwnd, vmid=hwnd * 10, accessible_context=hwnd * 100, root_element=None)
+        self.drivers.append(driver)
+        return driver
+
+
+@pytest.fixture
+def windows(monkeypatch):
+    windows = Windows()
+    bridge = types.SimpleNamespace(isJavaWindow=lambda hwnd: hwnd in windows.java)
+    monkeypatch.setattr(pyjab.win32gui, 'IsWindow', lambda hwnd: hwnd in windows.pids, raising=False)
+    monkeypatch.setattr(pyjab.win32process, 'GetWindowThreadProcessId',
+                        lambda hwnd: (1, windows.pids.get(hwnd, 0)), raising=False)
+    monkeypatch.setattr(pyjab.JABRuntime, 'instance', classmethod(lambda cls: types.SimpleNamespace(bridge=bridge)))
+    monkeypatch.setattr(pyjab, 'JDriver', lambda hwnd: windows.driver(hwnd))
+    monkeypatch.setattr(pyjab, 'Win32Utils', lambda: types.SimpleNamespace(
+        get_hwnds_by_title=lambda title: [hwnd for hwnd, text in windows.titles.items() if fnmatch(text, title)]))
+    return windows
+
+
+@pytest.fixture
+def cache():
+    return JWindowCache()
+
+
+def test_java_window_is_classified_once(windows, cache):
+    windows.add(1, 100)
+    assert cache.get(1).kind == JWindowKind.JAVA
+    assert cache.driver(1) is cache.driver(1)
+    assert len(windows.drivers) == 1
+    assert (cache.get(1).vmid, cache.get(1).accessible_context) == (10, 100)
+
+
+def test_non_java_window_has_no_driver(windows, cache):
+    windows.add(2, 200, java=False)
+    assert cache.driver(2) is None
+    assert cache.get(2).kind == JWindowKind.NON_JAVA
+    assert windows.drivers == []
+
+
+def test_unknown_window_is_classified_again(windows, cache):
+    windows.add(3, 300)
+    windows.failing.add(3)
+    assert cache.get(3).kind == JWindowKind.UNKNOWN
+    windows.failing.clear()
+    assert cache.get(3).kind == JWindowKind.JAVA
+
+
+def test_hwnd_reused_by_other_process(windows, cache):
+    windows.add(1, 100)
+    first = cache.driver(1)
+    windows.add(1, 101)
+    assert cache.driver(1) is not first
+
+
+def test_purge_drops_destroyed_windows(windows, cache):
+    windows.add(1, 100)
+    windows.add(2, 200, java=False)
+    cache.get(1), cache.get(2)
+    del windows.pids[1]
+    cache.purge()
+    assert len(cache) == 1
+
+
+def test_invalidate(windows, cache):
+    windows.add(1, 100)
+    first = cache.driver(1)
+    cache.invalidate(1)
+    assert cache.driver(1) is not first
+
+
+def test_no_access_bridge(windows, cache, monkeypatch):
+    def missing(cls):
+        raise FileNotFoundError('WindowsAccessBridge-64.dll')
+    monkeypatch.setattr(pyjab.JABRuntime, 'instance', classmethod(missing))
+    windows.add(1, 100)
+    assert cache.get(1).kind == JWindowKind.NON_JAVA
+
+
+def test_driver_by_title_is_cached(windows, cache):
+    windows.add(1, 100, java=False, title='Editor')
+    windows.add(2, 200, title='Editor')
+    driver = cache.driver_by_title('Edit*')
+    assert driver.hwnd == 2
+    assert cache.driver_by_title('Edit*') is driver
+    assert len(windows.drivers) == 1
+    assert cache.driver_by_title('Viewer') is None
@@ -1,6 +1,19 @@
-from typing import Dict, List
-from PySide6.QtWidgets import QTreeWidgetItem, QTableView
-from PySide6.QtCore import QAbstractTableModel, Qt
+from __future__ import annotations
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set
+from PySide6.QtWidgets import QTableView
+from PySide6.QtGui import QFont
+from PySide6.QtCore import QAbstractItemModel, QAbstractTableModel, QModelIndex, Qt
+import re
+import time
+
+# seconds the properties of a tree item are shown again without being read
+PROPERTY_TTL = 10
+# number of tree items watched for property change events, least recently shown items are dropped
+MAX_WATCHED_ITEMS = 32
+# number of items returned by a search of the loaded items
+MAX_SEARCH_RESULTS = 200
 
 class PropertyTableModel(QAbstractTableModel):
 
@@ -9,6 +22,7 @@ class PropertyTableModel(QAbstractTableModel):
     def __init__(self, data):
         super().__init__()
         self._data = data
+        self._freshness = ''
 
     def data(self, index, role):
         if role == Qt.DisplayRole:
@@ -24,6 +38,8 @@ class PropertyTableModel(QAbstractTableModel):
     def headerData(self, section, orientation, role):
         if role == Qt.DisplayRole:
             if orientation == Qt.Horizontal:
+                if section == 1 and self._freshness:
+                    return f'{self.Columns[section]} ({self._freshness})'
                 return self.Columns[section]
 
     def flags(self, index):
@@ -31,10 +47,99 @@ class PropertyTableModel(QAbstractTableModel):
             return super().flags(index) | Qt.ItemIsEditable
         return super().flags(index)
 
-class UITreeItem(QTreeWidgetItem):
+    def set_freshness(self, freshness: str) -> None:
+        """
+        Show freshness of the values in the header of value column.
+        """
+        self._freshness = freshness
+        self.headerDataChanged.emit(Qt.Horizontal, 1, 1)
+
+    def refresh(self) -> None:
+        self.dataChanged.emit(self.index(0, 0), self.index(len(self._data[0]) - 1, len(self._data) - 1))
+
+class UITreeItem:
+    """
+    Node of the visual tree shown by UITreeModel, it is added to its parent by the model.
+    Subclasses declare __slots__ too, a node keeps no per-instance dict.
+    """
+    __slots__ = ('_parent', '_children', '_row', '_label', '_font', '_fetched', '_has_children',
+                 '_placeholder', '_properties_time', '__weakref__')
 
-    def addChild(self, child: QTreeWidgetItem) -> None:
-        return super().addChild(child)
+    property_ttl = PROPERTY_TTL
+    _watched: OrderedDict[int, UITreeItem] = OrderedDict()
+
+    def __init__(self, parent: Optional[UITreeItem], label: str) -> None:
+        self._parent = parent
+        self._children: List[UITreeItem] = []
+        # position in the children of parent, kept by the model
+        self._row = 0
+        self._label = label
+        self._font: Optional[QFont] = None
+        self._fetched = False
+        # unknown until the children are fetched
+        self._has_children = True
+        self._placeholder: Optional[LoadingPlaceholder] = None
+        # time of last properties read, None before first read, 0 after invalidation
+        self._properties_time: Optional[float] = None
+
+    @property
+    def label(self) -> str:
+        return self._label
+
+    @property
+    def parent_item(self) -> Optional[UITreeItem]:
+        return self._parent
+
+    @property
+    def fetched(self) -> bool:
+        return self._fetched
+
+    @property
+    def loading(self) -> bool:
+        return self._placeholder is not None
+
+    @property
+    def load_error(self) -> Optional[str]:
+        """
+        Message of the failed loading of the children, shown by the placeholder until the children are cleared.
+        """
+        return self._placeholder.error if self._placeholder is not None else None
+
+    @property
+    def key(self) -> Optional[Hashable]:
+        """
+        Identity of the live control, unique in the tree. The model indexes items by key and a refresh
+        keeps the item whose key matches a live child. None when the control cannot be identified,
+        the item is then not indexed and it is replaced by a refresh.
+        """
+        return None
+
+    @property
+    def search_terms(self) -> Iterable[str]:
+        """
+        Values of the item found by a search, they must be known without remote calls.
+        """
+        return (self._label,)
+
+    def is_alive(self) -> bool:
+        """
+        Return whether the control of the item still exists.
+        """
+        return True
+
+    def update_from(self, other: UITreeItem) -> None:
+        """
+        Take the values of other, an item created by a refresh for the control of this item.
+        """
+
+    def child(self, index: int) -> UITreeItem:
+        return self._children[index]
+
+    def childCount(self) -> int:
+        return len(self._children)
+
+    def children(self) -> List[UITreeItem]:
+        return list(self._children)
 
     @property
     def control(self):
@@ -56,8 +161,440 @@ class UITreeItem(QTreeWidgetItem):
     def model(self) -> QAbstractTableModel:
         raise NotImplementedError
 
+    def invalidate_properties(self) -> None:
+        """
+        Read properties again next time they are shown, can be called from any thread.
+        """
+        if self._properties_time is not None:
+            self._properties_time = 0
+
+    def watch_properties(self) -> None:
+        """
+        Subscribe to the change events which invalidate the properties.
+        """
+
+    def unwatch_properties(self) -> None:
+        pass
+
+    def watch_children(self, callback: Callable[[], None]) -> None:
+        """
+        Subscribe to the events of changed children, callback is called with no argument in any thread.
+        """
+
+    def unwatch_children(self) -> None:
+        pass
+
+    def _reset_properties(self) -> None:
+        """
+        Drop the values kept by the item before properties are read again.
+        """
+
+    @classmethod
+    def unwatch_all(cls) -> None:
+        while cls._watched:
+            _, item = cls._watched.popitem()
+            item.unwatch_properties()
+
+    def _watch(self) -> None:
+        watched = UITreeItem._watched
+        if id(self) in watched:
+            watched.move_to_end(id(self))
+            return
+        self.watch_properties()
+        watched[id(self)] = self
+        while len(watched) > MAX_WATCHED_ITEMS:
+            _, item = watched.popitem(last=False)
+            item.unwatch_properties()
+            # changes are not reported anymore
+            item.invalidate_properties()
+
     def update_property_table(self, table: QTableView) -> None:
-        self.data[1] = self.properties
+        now = time.time()
+        if self._properties_time is None or now - self._properties_time > self.property_ttl:
+            if self._properties_time is not None:
+                self._reset_properties()
+            self.data[1] = self.properties
+            self._properties_time = now
+            self._watch()
+            self.model.refresh()
+            self.model.set_freshness('just read')
+        else:
+            self.model.set_freshness(f'cached {round(now - self._properties_time)}s ago')
         if self.model is table.model():
             return
-        table.setModel(self.model)
\ No newline at end of file
+        table.setModel(self.model)
+
+
+class TreeSearchIndex:
+    """
+    Inverted index from the words of the search terms of tree items to the items.
+    A query matches the items having, for every word of the query, a word starting with it.
+    Identifiers are split at underscores and case changes, their words are indexed together with
+    the whole identifier, so both "cancel" and "okcan" find "OK_Cancel" or "okCancel".
+    """
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, UITreeItem]] = {}
+        # indexed words in order, the words starting with a prefix are a slice of it,
+        # it is sorted again by the first search after words are added or removed
+        self._words: List[str] = []
+        self._words_changed = False
+        self._item_words: Dict[int, List[str]] = {}
+
+    @staticmethod
+    def split(text: str) -> List[str]:
+        """
+        Return the lowercase words of text, split at non word characters, underscores, case changes and digits.
+        """
+        words = []
+        for token in re.findall(r'[^\W_]+', text):
+            parts = re.findall(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+', token)
+            if ''.join(parts) == token:
+                words.extend(part.lower() for part in parts)
+            else:
+                # letters outside ascii have no parts
+                words.append(token.lower())
+        return words
+
+    @classmethod
+    def index_words(cls, text: str) -> Set[str]:
+        """
+        Return the words of text and its identifiers without underscores.
+        """
+        return {*cls.split(text), *(token.lower().replace('_', '') for token in re.findall(r'\w+', text))}
+
+    def add(self, item: UITreeItem) -> None:
+        if id(item) in self._item_words:
+            self.remove(item)
+        words = list({word for term in item.search_terms if term for word in self.index_words(str(term))})
+        self._item_words[id(item)] = words
+        for word in words:
+            items = self._postings.get(word)
+            if items is None:
+                items = self._postings[word] = {}
+                self._words_changed = True
+            items[id(item)] = item
+
+    def remove(self, item: UITreeItem) -> None:
+        for word in self._item_words.pop(id(item), ()):
+            items = self._postings[word]
+            items.pop(id(item), None)
+            if not items:
+                del self._postings[word]
+                self._words_changed = True
+
+    def clear(self) -> None:
+        self._postings = {}
+        self._words = []
+        self._words_changed = False
+        self._item_words = {}
+
+    def _matches(self, prefix: str) -> Dict[int, UITreeItem]:
+        start = bisect_left(self._words, prefix)
+        matches: Dict[int, UITreeItem] = {}
+        for word in self._words[start:bisect_left(self._words, prefix + '\uffff', start)]:
+            matches.update(self._postings[word])
+        return matches
+
+    def search(self, query: str, limit: int = MAX_SEARCH_RESULTS) -> List[UITreeItem]:
+        # longest words first, they match the fewest items
+        prefixes = sorted(set(self.split(query)), key=len, reverse=True)
+        if not prefixes:
+            return []
+        if self._words_changed:
+            self._words = sorted(self._postings)
+            self._words_changed = False
+        matches = self._matches(prefixes[0])
+        for prefix in prefixes[1:]:
+            if not matches:
+                break
+            others = self._matches(prefix)
+            matches = {key: item for key, item in matches.items() if key in others}
+        return list(matches.values())[:limit]
+
+    def __len__(self) -> int:
+        return len(self._item_words)
+
+
+class LoadingPlaceholder:
+    """
+    Disabled last row of an item whose children are being loaded, or whose loading failed with error.
+    """
+    __slots__ = ('_parent', 'error')
+
+    loading_label = 'Loading…'
+    failed_label = 'Loading failed: {}'
+
+    def __init__(self, parent: UITreeItem) -> None:
+        self._parent = parent
+        self.error: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        return self.loading_label if self.error is None else self.failed_label.format(self.error)
+
+
+class UITreeModel(QAbstractItemModel):
+    """
+    Model of the visual tree, the children of an item are requested from fetch_children
+    when the view expands it, the fetched children are added with insert_children.
+    """
+    def __init__(self, fetch_children: Callable[[UITreeItem], None]):
+        super().__init__()
+        self._roots: List[UITreeItem] = []
+        self._fetch_children = fetch_children
+        # loaded items by key
+        self._items: Dict[Hashable, UITreeItem] = {}
+        self.search_index = TreeSearchIndex()
+
+    def find_item(self, key: Hashable) -> Optional[UITreeItem]:
+        """
+        Return the loaded item of key, None when there is none or it is not in the tree anymore.
+        """
+        item = self._items.get(key)
+        if item is None or self.contains(item):
+            return item
+        del self._items[key]
+        return None
+
+    def _index_items(self, items: Iterable[UITreeItem]) -> None:
+        for item in items:
+            if (key := item.key) is not None:
+                self._items[key] = item
+            self.search_index.add(item)
+
+    def _unindex_items(self, items: Iterable[UITreeItem]) -> None:
+        stack = list(items)
+        while stack:
+            item = stack.pop()
+            if (key := item.key) is not None and self._items.get(key) is item:
+                del self._items[key]
+            self.search_index.remove(item)
+            stack.extend(item._children)
+
+    def contains(self, item: UITreeItem) -> bool:
+        """
+        Return whether item is still in the tree.
+        """
+        while item._parent is not None:
+            siblings = item._parent._children
+            if item._row >= len(siblings) or siblings[item._row] is not item:
+                return False
+            item = item._parent
+        return item._row < len(self._roots) and self._roots[item._row] is item
+
+    def set_roots(self, roots: Iterable[UITreeItem]) -> None:
+        self.beginResetModel()
+        self._roots = list(roots)
+        for row, item in enumerate(self._roots):
+            item._row = row
+        self._items = {}
+        self.search_index.clear()
+        self._index_items(self._roots)
+        self.endResetModel()
+
+    def item(self, index: QModelIndex) -> Optional[UITreeItem | LoadingPlaceholder]:
+        if not index.isValid():
+            return None
+        return index.internalPointer()
+
+    def index_of(self, item: Optional[UITreeItem | LoadingPlaceholder]) -> QModelIndex:
+        if item is None:
+            return QModelIndex()
+        if isinstance(item, LoadingPlaceholder):
+            return self.createIndex(len(item._parent._children), 0, item)
+        return self.createIndex(item._row, 0, item)
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        item = self.item(parent)
+        children = self._roots if item is None else item._children
+        if 0 <= row < len(children):
+            return self.createIndex(row, column, children[row])
+        if item is not None and row == len(children) and item._placeholder is not None:
+            return self.createIndex(row, column, item._placeholder)
+        return QModelIndex()
+
+    def parent(self, index: QModelIndex) -> QModelIndex:
+        item = self.item(index)
+        if item is None:
+            return QModelIndex()
+        return self.index_of(item._parent)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        item = self.item(parent)
+        if item is None:
+            return len(self._roots)
+        if isinstance(item, LoadingPlaceholder):
+            return 0
+        return len(item._children) + (item._placeholder is not None)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 1
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        item = self.item(parent)
+        if item is None:
+            return bool(self._roots)
+        if isinstance(item, LoadingPlaceholder):
+            return False
+        return item._has_children or item._placeholder is not None
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        item = self.item(parent)
+        return isinstance(item, UITreeItem) and not item._fetched and item._placeholder is None
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        item = self.item(parent)
+        if isinstance(item, UITreeItem):
+            self._fetch_children(item)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        item = self.item(index)
+        if item is None:
+            return None
+        if role == Qt.DisplayRole:
+            return item.label
+        if role == Qt.FontRole and isinstance(item, UITreeItem):
+            return item._font
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if isinstance(self.item(index), LoadingPlaceholder):
+            return Qt.NoItemFlags
+        return super().flags(index)
+
+    def insert_children(self, item: UITreeItem, children: List[UITreeItem]) -> None:
+        """
+        Append children to item, before the loading placeholder.
+        """
+        if not children:
+            return
+        first = len(item._children)
+        self.beginInsertRows(self.index_of(item), first, first + len(children) - 1)
+        for row, child in enumerate(children, first):
+            child._row = row
+        item._children.extend(children)
+        self._index_items(children)
+        self.endInsertRows()
+
+    def sync_children(self, item: UITreeItem, children: List[UITreeItem]) -> None:
+        """
+        Make children the children of item. Current children which are kept are moved instead of
+        being replaced, so the view keeps their expansion and selection. Item must not be loading.
+        """
+        parent = self.index_of(item)
+        current = item._children
+        old = set(map(id, current))
+        kept = set(map(id, children))
+        # remove ranges from the end, so the rows of the ranges still to remove do not change
+        row = len(current) - 1
+        while row >= 0:
+            if id(current[row]) in kept:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and id(current[row]) not in kept:
+                row -= 1
+            self.beginRemoveRows(parent, row + 1, last)
+            self._unindex_items(current[row + 1:last + 1])
+            del current[row + 1:last + 1]
+            self.endRemoveRows()
+        self._renumber(item, 0)
+        for row, child in enumerate(children):
+            if row < len(current) and current[row] is child:
+                continue
+            if id(child) in old:
+                # rows before row are in place already, so child is below row
+                source = child._row
+                self.beginMoveRows(parent, source, source, parent, row)
+                current.insert(row, current.pop(source))
+                self._renumber(item, row, source + 1)
+                self.endMoveRows()
+            else:
+                self.beginInsertRows(parent, row, row)
+                current.insert(row, child)
+                self._renumber(item, row)
+                self._index_items([child])
+                self.endInsertRows()
+
+    @staticmethod
+    def _renumber(item: UITreeItem, start: int, stop: Optional[int] = None) -> None:
+        children = item._children
+        for row in range(start, len(children) if stop is None else stop):
+            children[row]._row = row
+
+    def update_item(self, item: UITreeItem, other: UITreeItem) -> None:
+        """
+        Update item from other, an item created by a refresh for the control of item, with its label and search terms.
+        """
+        item.update_from(other)
+        if item.label != other.label:
+            self.set_label(item, other.label)
+        else:
+            self.search_index.add(item)
+
+    def set_label(self, item: UITreeItem, label: str) -> None:
+        item._label = label
+        self.search_index.add(item)
+        index = self.index_of(item)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def set_loading(self, item: UITreeItem, loading: bool) -> None:
+        """
+        Show or hide the loading placeholder of item.
+        """
+        if loading == (item._placeholder is not None):
+            return
+        row = len(item._children)
+        if loading:
+            self.beginInsertRows(self.index_of(item), row, row)
+            item._placeholder = LoadingPlaceholder(item)
+            self.endInsertRows()
+        else:
+            self.beginRemoveRows(self.index_of(item), row, row)
+            item._placeholder = None
+            self.endRemoveRows()
+
+    def set_load_error(self, item: UITreeItem, message: str) -> None:
+        """
+        Remove the children added before loading the children of item failed and show message in its placeholder.
+        Item stays not fetched, it is fetched again once clear_children removed the placeholder.
+        """
+        count = len(item._children)
+        if count > 0:
+            self.beginRemoveRows(self.index_of(item), 0, count - 1)
+            self._unindex_items(item._children)
+            item._children = []
+            self.endRemoveRows()
+        self.set_loading(item, True)
+        item._placeholder.error = message
+        index = self.index_of(item._placeholder)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def set_fetched(self, item: UITreeItem) -> None:
+        """
+        Mark the children of item as complete, an item without children loses its expand indicator.
+        """
+        item._fetched = True
+        if not item._children and item._has_children:
+            item._has_children = False
+            index = self.index_of(item)
+            self.dataChanged.emit(index, index)
+
+    def clear_children(self, item: UITreeItem) -> None:
+        """
+        Remove the children of item, they are fetched again when it is expanded.
+        """
+        count = self.rowCount(self.index_of(item))
+        if count > 0:
+            self.beginRemoveRows(self.index_of(item), 0, count - 1)
+            self._unindex_items(item._children)
+            item._children = []
+            item._placeholder = None
+            self.endRemoveRows()
+        item._fetched = False
+        item._has_children = True
+
+    def set_font(self, item: UITreeItem, font: Optional[QFont]) -> None:
+        item._font = font
+        index = self.index_of(item)
+        self.dataChanged.emit(index, index, [Qt.FontRole])
@@ -1,11 +1,26 @@
 from __future__ import annotations
-from ctypes import byref
-from typing import Any, Dict, Mapping, Optional, Tuple, Generator
+from ctypes import CFUNCTYPE, byref, c_long, c_void_p, c_wchar_p, cast, create_string_buffer
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Generator
 from pyjab.jabdriver import JABDriver, JABElement, By
+from pyjab.jabfixedfunc import JABFixedFunc
+from pyjab.common.service import Service
+from pyjab.common.win32utils import Win32Utils
+from pyjab.accessibleinfo import AccessibleContextInfo, AccessibleTableCellInfo, AccessibleTableInfo, VisibleChildrenInfo
+from pyjab.config import MAX_VISIBLE_CHILDREN, TIMEOUT as JAB_TIMEOUT
+from pyjab.common.logger import Logger
 from pyjab.common.types import JOBJECT64
 from pyjab.common.exceptions import JABException
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import codecs
+import threading
 import time
+import weakref
 import re
+import pythoncom
+import win32event
+import win32gui
+import win32process
 
 class JException(Exception):
     pass
@@ -18,18 +33,422 @@ class JTimeoutError(JException):
 
 TIMEOUT = 60
 IGNORED_EXCEPTIONS = (JElementNotFoundException, JABException)
+# longest wait between two checks of an event driven wait when no event arrives
+EVENT_FALLBACK_INTERVAL = 5
+# shortest wait between two checks of an event driven wait, a burst of events causes one check
+MIN_EVENT_INTERVAL = 0.1
+# first and longest wait between two checks of a polling wait
+POLL_INTERVAL = 0.05
+MAX_POLL_INTERVAL = 0.5
+# characters read by one getAccessibleTextRange call, its length argument is a short including the terminator
+TEXT_CHUNK_SIZE = 8192
+MAX_TEXT_CHUNK_SIZE = 32766
+
+# Java Access Bridge event callbacks
+PropertyChangeFP = CFUNCTYPE(None, c_long, JOBJECT64, JOBJECT64, c_wchar_p, c_wchar_p, c_wchar_p)
+PropertyChildChangeFP = CFUNCTYPE(None, c_long, JOBJECT64, JOBJECT64, JOBJECT64, JOBJECT64)
+FocusGainedFP = CFUNCTYPE(None, c_long, JOBJECT64, JOBJECT64)
+
+class TraversalStrategy:
+    """
+    Order in which descendants of a JElement are visited.
+    - DFS: depth first, pre-order, same order as the element tree
+    - BFS: breadth first, shallow elements are found before deep ones
+    - IDDFS: iterative deepening, breadth first order with a small memory footprint
+    """
+    DFS = 'dfs'
+    BFS = 'bfs'
+    IDDFS = 'iddfs'
+
+class SearchStats:
+    """
+    Counters collected by one element search.
+    bridge_calls counts Java Access Bridge round trips, nodes_visited counts compared elements,
+    pruned counts elements whose children were skipped by a PruneRule,
+    visible_pages counts getVisibleChildren calls of visible only searches.
+    """
+    def __init__(self):
+        self.bridge_calls = 0
+        self.nodes_visited = 0
+        self.pruned = 0
+        self.visible_pages = 0
+
+    def __repr__(self) -> str:
+        return (f'SearchStats(bridge_calls={self.bridge_calls}, nodes_visited={self.nodes_visited}, pruned={self.pruned}, '
+                f'visible_pages={self.visible_pages})')
+
+class PruneRule:
+    """
+    Decide which subtrees a search never enumerates, the pruned element itself is still compared.
+    - roles: roles whose children are skipped, e.g. ('table', 'tree', 'list')
+    - max_children: skip children of elements having more children than this
+    - predicate: callable receiving the JElement, returns True to skip its children
+    """
+    CONTAINER_ROLES = ('table', 'tree', 'list')
+
+    def __init__(self, roles: Iterable[str] = (), max_children: int = None, predicate: Callable[[JElement], bool] = None):
+        self.roles = tuple(roles)
+        self.max_children = max_children
+        self.predicate = predicate
+
+    def __call__(self, jelement: JElement, stats: SearchStats = None) -> bool:
+        info = jelement.context_info(stats=stats)
+        if self.roles and (info.role in self.roles or info.role_en_US in self.roles):
+            return True
+        if self.max_children is not None and info.childrenCount > self.max_children:
+            return True
+        return bool(self.predicate and self.predicate(jelement))
+
+    def __repr__(self) -> str:
+        args = []
+        if self.roles:
+            args.append(f'roles={self.roles!r}')
+        if self.max_children is not None:
+            args.append(f'max_children={self.max_children}')
+        if self.predicate is not None:
+            args.append(f'predicate={self.predicate!r}')
+        return f"PruneRule({', '.join(args)})"
+
+    @classmethod
+    def from_value(cls, value: PruneRule | Mapping | Callable | None) -> Optional[PruneRule]:
+        """
+        Accept a PruneRule, a mapping of PruneRule arguments or a predicate.
+        """
+        if value is None or isinstance(value, PruneRule):
+            return value
+        if isinstance(value, Mapping):
+            return cls(**value)
+        if callable(value):
+            return cls(predicate=value)
+        raise JException(f'Incorrect prune rule: {value!r}')
+
+class JEventKind:
+    """
+    Kinds of Java Access Bridge events dispatched by JEventMonitor.
+    """
+    PROPERTY = 'property'
+    CHILDREN = 'children'
+    FOCUS = 'focus'
+    ALL = (PROPERTY, CHILDREN, FOCUS)
+
+class JEventSubscription:
+    """
+    Receive the Java Access Bridge events of one java virtual machine, of the JEventKind in kinds.
+    When source is given only the events whose source is the same java object are received.
+    callback is called with no argument on every event, in the thread which pumps the bridge messages.
+    """
+    def __init__(self, monitor: JEventMonitor, vmid: int, callback: Callable[[], None] = None,
+            kinds: Tuple[str, ...] = JEventKind.ALL, source: JElement = None):
+        self.vmid = vmid
+        self.kinds = kinds
+        # the element is kept, so its java object is not released while subscribed
+        self.source = source
+        self._monitor = monitor
+        self._callback = callback
+        # auto reset event, can be waited together with the message queue
+        self._handle = win32event.CreateEvent(None, False, False, None)
+
+    def notify(self) -> None:
+        win32event.SetEvent(self._handle)
+        if self._callback:
+            self._callback()
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Wait at most timeout seconds for an event, return whether an event arrived.
+        Window messages of current thread are dispatched while waiting, so events are
+        delivered also when the bridge runs in current thread.
+        """
+        end = time.time() + timeout
+        while (remaining := end - time.time()) > 0:
+            rc = win32event.MsgWaitForMultipleObjects(
+                [self._handle], False, int(remaining * 1000), win32event.QS_ALLINPUT
+            )
+            if rc == win32event.WAIT_OBJECT_0:
+                return True
+            if rc == win32event.WAIT_OBJECT_0 + 1:
+                pythoncom.PumpWaitingMessages()
+        return False
+
+    def close(self) -> None:
+        self._monitor.unsubscribe(self)
+
+    def __enter__(self) -> JEventSubscription:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+class JHandleArena:
+    """
+    Own the Java objects of the JElements created by a search and release them together when the arena is released.
+    Elements handed to the caller are promoted out of the arena and release their object themselves.
+    JElements which are not promoted must not be used after the arena is released.
+    """
+    def __init__(self):
+        self._handles: Dict[Tuple[int, int], Tuple[Any, weakref.ref]] = {}
+
+    def adopt(self, jelement: JElement) -> JElement:
+        if jelement.accessible_context and not jelement._released:
+            jelement._arena = self
+            self._handles[(jelement.vmid, jelement.accessible_context)] = (jelement.bridge, weakref.ref(jelement))
+        return jelement
+
+    def promote(self, jelement: JElement) -> JElement:
+        if jelement._arena is self:
+            del self._handles[(jelement.vmid, jelement.accessible_context)]
+            jelement._arena = None
+        return jelement
+
+    def release(self) -> None:
+        handles, self._handles = self._handles, {}
+        for (vmid, accessible_context), (bridge, ref) in handles.items():
+            if (jelement := ref()) is not None:
+                jelement._released = True
+                jelement._arena = None
+            bridge.releaseJavaObject(vmid, accessible_context)
+        JElement._count_handles(-len(handles))
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+    def __enter__(self) -> JHandleArena:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+def wait_until(condition: Callable[[], Any], timeout: float, interval = POLL_INTERVAL, max_interval = MAX_POLL_INTERVAL,
+               backoff = 2, ignored_exceptions: Tuple[type, ...] = (), subscription: JEventSubscription = None,
+               message = '', reraise = False, min_interval = MIN_EVENT_INTERVAL) -> Any:
+    """
+    Call condition until it returns a truthy value, which is returned, or timeout seconds elapse.
+    The wait between two calls starts at interval and is multiplied by backoff up to max_interval,
+    with a subscription it ends as soon as the java virtual machine reports an event, but not before
+    min_interval seconds passed since the previous call.
+    Exceptions in ignored_exceptions are retried. On timeout the last of them is raised when reraise
+    is True, otherwise JTimeoutError(message, stacktrace) is raised.
+    """
+    end = time.time() + timeout
+    delay = interval
+    last_exception = None
+    while True:
+        checked = time.time()
+        try:
+            result = condition()
+            if result:
+                return result
+        except ignored_exceptions as ex:
+            last_exception = ex
+        if (remaining := end - time.time()) <= 0:
+            break
+        if subscription:
+            if subscription.wait(min(delay, remaining)):
+                # events arriving meanwhile are coalesced by the next check
+                while (pause := min(checked + min_interval, end) - time.time()) > 0:
+                    subscription.wait(pause)
+        else:
+            time.sleep(min(delay, remaining))
+        delay = min(delay * backoff, max_interval)
+
+    if reraise and last_exception is not None:
+        raise last_exception
+    raise JTimeoutError(message, getattr(last_exception, 'stacktrace', None))
+
+class JEventMonitor:
+    """
+    Dispatch Java Access Bridge property change, children change and focus events to subscriptions.
+    Callbacks are process wide, so there is one monitor per process. They are registered while there are
+    subscriptions, so the java virtual machines do not send events nobody waits for.
+    """
+    _instance: JEventMonitor = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def instance(cls, bridge) -> JEventMonitor:
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls(bridge)
+            return cls._instance
+
+    def __init__(self, bridge):
+        self.bridge = bridge
+        self._subscriptions: List[JEventSubscription] = []
+        self._subscriptions_lock = threading.Lock()
+        # serializes the registration of callbacks, which may wait for the java virtual machines,
+        # so it is done without holding the lock taken by the callbacks
+        self._registration_lock = threading.Lock()
+        # keep references of callbacks, otherwise they are garbage collected
+        self._callbacks = (
+            PropertyChangeFP(self._on_property_change),
+            PropertyChildChangeFP(self._on_property_child_change),
+            FocusGainedFP(self._on_focus_gained)
+        )
+
+    def _set_callbacks(self, enabled: bool) -> None:
+        for setter, callback in zip(
+                ('setPropertyChangeFP', 'setPropertyChildChangeFP', 'setFocusGainedFP'), self._callbacks):
+            getattr(self.bridge, setter)(cast(callback, c_void_p) if enabled else None)
+
+    def subscribe(self, vmid: int, callback: Callable[[], None] = None,
+            kinds: Tuple[str, ...] = JEventKind.ALL, source: JElement = None) -> JEventSubscription:
+        subscription = JEventSubscription(self, vmid, callback, kinds, source)
+        with self._registration_lock:
+            with self._subscriptions_lock:
+                first = not self._subscriptions
+                self._subscriptions.append(subscription)
+            if first:
+                self._set_callbacks(True)
+        return subscription
+
+    def unsubscribe(self, subscription: JEventSubscription) -> None:
+        with self._registration_lock:
+            with self._subscriptions_lock:
+                if subscription not in self._subscriptions:
+                    return
+                self._subscriptions.remove(subscription)
+                last = not self._subscriptions
+            if last:
+                self._set_callbacks(False)
+
+    def _dispatch(self, vmid: int, kind: str, source: JOBJECT64, *java_objects: JOBJECT64) -> None:
+        with self._subscriptions_lock:
+            subscriptions = [
+                subscription for subscription in self._subscriptions
+                if subscription.vmid == vmid and kind in subscription.kinds
+            ]
+        try:
+            # source is compared while it is still valid
+            subscriptions = [
+                subscription for subscription in subscriptions
+                if subscription.source is None or source and self.bridge.isSameObject(
+                    vmid, source, subscription.source.accessible_context)
+            ]
+        finally:
+            # event objects are owned by the receiver
+            for obj in (source, *java_objects):
+                if obj:
+                    self.bridge.releaseJavaObject(vmid, obj)
+        for subscription in subscriptions:
+            subscription.notify()
+
+    def _on_property_change(self, vmid, event, source, property, old_value, new_value):
+        self._dispatch(vmid, JEventKind.PROPERTY, source, event)
+
+    def _on_property_child_change(self, vmid, event, source, old_child, new_child):
+        self._dispatch(vmid, JEventKind.CHILDREN, source, event, old_child, new_child)
+
+    def _on_focus_gained(self, vmid, event, source):
+        self._dispatch(vmid, JEventKind.FOCUS, source, event)
+
+class JABRuntime:
+    """
+    Java Access Bridge shared by all JDriver of the process.
+    The bridge dll is loaded, started and its functions are fixed once, and one message pump is reused.
+    """
+    _instance: Optional[JABRuntime] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def instance(cls, bridge_dll = '') -> JABRuntime:
+        """
+        Return the runtime of the process, bridge_dll is only used by the first call.
+        """
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls(bridge_dll)
+            return cls._instance
+
+    def __init__(self, bridge_dll = ''):
+        self.bridge = Service().load_library(bridge_dll)
+        self.bridge.Windows_run()
+        JABFixedFunc(self.bridge)._fix_bridge_functions()
+        self._pump = None
+        self._pump_lock = threading.Lock()
+        # java virtual machines connect to the bridge through window messages
+        self.pump_messages()
+
+    @property
+    def event_monitor(self) -> JEventMonitor:
+        return JEventMonitor.instance(self.bridge)
+
+    def pump_messages(self) -> None:
+        """
+        Run one round of the shared message pump, it waits at most 200ms for window messages.
+        """
+        with self._pump_lock:
+            if self._pump is None:
+                self._pump = Win32Utils().setup_msg_pump()
+            try:
+                next(self._pump)
+            except StopIteration:
+                # the pump quits on WM_QUIT, a new one is created by next round
+                self._pump = None
+
+class JSerializedBridge:
+    """
+    Access Bridge whose function calls are serialized by lock.
+    The bridge passes the calls into one java virtual machine through a shared memory buffer of its connection,
+    so calls from several threads into the same virtual machine must not overlap, calls into different
+    virtual machines may.
+    """
+    def __init__(self, bridge, lock: threading.Lock):
+        self.bridge = bridge
+        self._lock = lock
+
+    def __getattr__(self, name: str) -> Any:
+        function = getattr(self.bridge, name)
+        if not callable(function):
+            return function
+        def call(*args):
+            with self._lock:
+                return function(*args)
+        return call
 
 class JDriver(JABDriver):
-    
+
+    def __init__(self, title = "", file_path = None, bridge_dll = "", hwnd = None, vmid = None,
+            accessible_context = None, timeout = JAB_TIMEOUT) -> None:
+        """
+        Same as JABDriver, except the bridge functions are not fixed again, JABRuntime fixes them once per process.
+        """
+        self.win32utils = Win32Utils()
+        self.file_path = file_path
+        self._title = title
+        if self.file_path:
+            self.open_application()
+        self.serv = Service()
+        self.logger = Logger("pyjab")
+        self.latest_log = None
+        self._bridge_dll = bridge_dll
+        self._timeout = timeout
+        self._hwnd = hwnd
+        self._vmid = vmid
+        self._pid = None
+        self._accessible_context = accessible_context
+        self._bridge = None
+        self._root_element = None
+        self.init_jab()
+
     @property
     def root_element(self) -> JElement:
         return self._root_element
 
+    @property
+    def runtime(self) -> JABRuntime:
+        return JABRuntime.instance(self._bridge_dll)
+
+    @property
+    def event_monitor(self) -> JEventMonitor:
+        return self.runtime.event_monitor
+
+    def _run_actor_sched(self) -> None:
+        self.runtime.pump_messages()
+
     def init_jab(self) -> None:
-        # load AccessBridge dll file
-        self.bridge = self.serv.load_library(self._bridge_dll)
-        self.bridge.Windows_run()
-        # setup message queue for actor scheduler
+        # AccessBridge dll file is loaded and started once per process
+        self.bridge = self.runtime.bridge
+        # java virtual machines started since the last round connect through pending window messages
         self._run_actor_sched()
         # wait java window by title and get hwnd if not specific hwnd and vmid
         if not (self.hwnd or (self.vmid and self.accessible_context)):
@@ -84,62 +503,452 @@ class JDriver(JABDriver):
         """
         self.__exit__(None, None, None)
 
-    def find_element_by_levels(self, search_levels: Tuple[Dict], visible = False) -> JElement:
-        return self._root_element.find_element_by_levels(search_levels, visible=visible)
+    def find_element_by_levels(self, search_levels: Tuple[Dict], visible = False, resume = False,
+            strategy = TraversalStrategy.DFS, prune = None, event_driven = False) -> JElement:
+        return self._root_element.find_element_by_levels(
+            search_levels, visible=visible, resume=resume, strategy=strategy, prune=prune, event_driven=event_driven)
 
-    def find_element_by_search_properties(self, visible = False, **search_properties) -> JElement:
-        return self._root_element.find_element(visible=visible, search_properties=search_properties)
+    def find_element_by_search_properties(self, visible = False, strategy = TraversalStrategy.DFS, prune = None,
+            **search_properties) -> JElement:
+        return self._root_element.find_element(
+            visible=visible, search_properties=search_properties, strategy=strategy, prune=prune)
+
+    def iter_elements(self, by = None, value = None, visible = False, *, search_properties = None,
+            strategy = TraversalStrategy.DFS, prune = None, start = 1, stop = None, limit = None) -> Generator[JElement]:
+        return self._root_element.iter_elements(
+            by, value, visible, search_properties=search_properties, strategy=strategy, prune=prune,
+            start=start, stop=stop, limit=limit)
+
+    def find_elements(self, by = None, value = None, visible = False, *, search_properties = None,
+            strategy = TraversalStrategy.DFS, prune = None, start = 1, stop = None, limit = None) -> List[JElement]:
+        return self._root_element.find_elements(
+            by, value, visible, search_properties=search_properties, strategy=strategy, prune=prune,
+            start=start, stop=stop, limit=limit)
+
+    @property
+    def last_search_stats(self) -> Optional[SearchStats]:
+        return self._root_element.last_search_stats
+
+    @staticmethod
+    def java_windows() -> List[JDriver]:
+        """
+        Return the drivers of all visible java top level windows.
+        """
+        hwnds = []
+        def collect(hwnd, _):
+            if win32gui.IsWindowVisible(hwnd):
+                hwnds.append(hwnd)
+            return True
+        win32gui.EnumWindows(collect, None)
+        cache = JWindowCache.instance()
+        return [driver for hwnd in hwnds if (driver := cache.driver(hwnd)) is not None]
+
+    @classmethod
+    def find_element_in_windows(cls, visible = False, strategy = TraversalStrategy.DFS, prune = None,
+            timeout = 0, max_workers: int = None, stats: Dict[int, SearchStats] = None, **search_properties) -> JElement:
+        """
+        Search all java top level windows concurrently with the same search properties and return the first match,
+        the searches still running are cancelled and the matches of the other searches are released.
+        Windows are enumerated again by every attempt until timeout.
+        Each search runs from its own root element, so searches share no snapshot. Searches in windows of
+        one java virtual machine take turns for every bridge call, see JSerializedBridge.
+        stats, when given, receives the SearchStats of the last search of each window by hwnd.
+        """
+        prune = PruneRule.from_value(prune)
+
+        def attempt() -> JElement:
+            drivers = cls.java_windows()
+            if not drivers:
+                raise JElementNotFoundException('No java window found.')
+            cancel = threading.Event()
+            locks: Dict[int, threading.Lock] = {}
+            roots: List[JElement] = []
+            futures = []
+            found = None
+            try:
+                for driver in drivers:
+                    root = driver.root_element
+                    bridge = JSerializedBridge(root.bridge, locks.setdefault(root.vmid, threading.Lock()))
+                    # the top level object of the root is the root itself, referenced again for this search
+                    context = bridge.getTopLevelObject(root.vmid, root.accessible_context)
+                    if not context:
+                        raise JABException(root.int_func_err_msg.format('getTopLevelObject'))
+                    roots.append(JElement(bridge, root.hwnd, root.vmid, context))
+                with ThreadPoolExecutor(max_workers or len(roots)) as executor:
+                    futures = [
+                        executor.submit(
+                            root.find_element,
+                            visible=visible, search_properties=search_properties, strategy=strategy, prune=prune,
+                            cancel=cancel)
+                        for root in roots
+                    ]
+                    try:
+                        for future in as_completed(futures):
+                            try:
+                                found = future.result()
+                                break
+                            except IGNORED_EXCEPTIONS:
+                                pass
+                    finally:
+                        cancel.set()
+            finally:
+                # every search has ended once the executor is shut down
+                for future in futures:
+                    if not future.cancelled() and future.exception() is None and future.result() is not found:
+                        future.result().release_jabelement()
+                for root in roots:
+                    if stats is not None and root.last_search_stats is not None:
+                        stats[root.hwnd] = root.last_search_stats
+                    root.release_jabelement()
+            if found is None:
+                raise JElementNotFoundException(f'JElement not found in java windows for {search_properties}.')
+            # the match is handed to the caller with the bridge of its driver
+            found.bridge = found.bridge.bridge
+            return found
+
+        return wait_until(attempt, timeout, ignored_exceptions=IGNORED_EXCEPTIONS, reraise=True)
+
+class JWindowKind:
+    """
+    Classification of a top level window.
+    - JAVA: window of a java virtual machine connected to the Access Bridge
+    - NON_JAVA: any other window
+    - UNKNOWN: the Access Bridge failed to classify the window, it is classified again by next lookup
+    """
+    JAVA = 'java'
+    NON_JAVA = 'non_java'
+    UNKNOWN = 'unknown'
+
+class JWindow:
+    """
+    Classification of one top level window, driver is set for java windows.
+    """
+    def __init__(self, hwnd: int, pid: int, kind: str, driver: JDriver = None):
+        self.hwnd = hwnd
+        self.pid = pid
+        self.kind = kind
+        self.driver = driver
+
+    @property
+    def vmid(self) -> Optional[int]:
+        return self.driver.vmid if self.driver else None
+
+    @property
+    def accessible_context(self) -> Optional[JOBJECT64]:
+        return self.driver.accessible_context if self.driver else None
+
+    @property
+    def root_element(self) -> Optional[JElement]:
+        return self.driver.root_element if self.driver else None
+
+    def is_alive(self) -> bool:
+        """
+        Return whether the window still exists, hwnd reused by a window of another process is not alive.
+        """
+        return bool(win32gui.IsWindow(self.hwnd)) and win32process.GetWindowThreadProcessId(self.hwnd)[1] == self.pid
+
+class JWindowCache:
+    """
+    Java window classification of top level windows keyed by hwnd, shared by the process.
+    A window is classified once while it exists, entries of destroyed windows are dropped.
+    """
+    _instance: Optional[JWindowCache] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> JWindowCache:
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self):
+        self._windows: Dict[int, JWindow] = {}
+        self._windows_lock = threading.Lock()
+
+    def get(self, hwnd: int) -> JWindow:
+        """
+        Return the classification of hwnd, the window is classified when it is not cached yet.
+        """
+        with self._windows_lock:
+            window = self._windows.get(hwnd)
+        if window is not None and window.kind != JWindowKind.UNKNOWN and window.is_alive():
+            return window
+        window = self._classify(hwnd)
+        with self._windows_lock:
+            self._windows[hwnd] = window
+        return window
+
+    def driver(self, hwnd: int) -> Optional[JDriver]:
+        """
+        Return the JDriver of hwnd, None when it is not a java window.
+        """
+        return self.get(hwnd).driver
+
+    def driver_by_title(self, title: str) -> Optional[JDriver]:
+        """
+        Return the JDriver of the first java window whose title matches the fnmatch pattern title,
+        None when there is none.
+        """
+        for hwnd in Win32Utils().get_hwnds_by_title(title):
+            if (driver := self.driver(hwnd)) is not None:
+                return driver
+        return None
+
+    def invalidate(self, hwnd: int) -> None:
+        with self._windows_lock:
+            self._windows.pop(hwnd, None)
+
+    def purge(self) -> None:
+        """
+        Drop the entries of destroyed windows.
+        """
+        with self._windows_lock:
+            windows = list(self._windows.values())
+        dead = [window.hwnd for window in windows if not window.is_alive()]
+        with self._windows_lock:
+            for hwnd in dead:
+                self._windows.pop(hwnd, None)
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    @staticmethod
+    def _classify(hwnd: int) -> JWindow:
+        pid = win32process.GetWindowThreadProcessId(hwnd)[1]
+        try:
+            runtime = JABRuntime.instance()
+        except FileNotFoundError:
+            # Access Bridge is not installed, there is no java window
+            return JWindow(hwnd, pid, JWindowKind.NON_JAVA)
+        if not runtime.bridge.isJavaWindow(hwnd):
+            return JWindow(hwnd, pid, JWindowKind.NON_JAVA)
+        try:
+            driver = JDriver(hwnd = hwnd)
+        except (RuntimeError, JABException):
+            return JWindow(hwnd, pid, JWindowKind.UNKNOWN)
+        return JWindow(hwnd, pid, JWindowKind.JAVA, driver)
 
 class JElement(JABElement):
 
+    # number of Java objects held by JElements and not released yet
+    _live_handles = 0
+    _live_handles_lock = threading.Lock()
+
     def __init__(self,
             bridge = None,
             hwnd = None,
             vmid = None,
             accessible_context = None,
             depth = 0):
+        self._released = not accessible_context
+        self._arena: Optional[JHandleArena] = None
         super().__init__(bridge, hwnd, vmid, accessible_context)
         self.depth = depth
+        self.last_search_stats: Optional[SearchStats] = None
+        self._info: Optional[AccessibleContextInfo] = None
+        if not self._released:
+            self._count_handles(1)
+
+    @classmethod
+    def live_handles(cls) -> int:
+        """
+        Return the number of Java objects held by JElements, a number growing over time indicates a leak.
+        """
+        return cls._live_handles
+
+    @classmethod
+    def _count_handles(cls, delta: int) -> None:
+        with cls._live_handles_lock:
+            cls._live_handles += delta
+
+    def release_jabelement(self, jabelement: JABElement = None) -> None:
+        """
+        Release the Java object of jabelement or of this element, at most once.
+        An element owned by a JHandleArena is released by the arena.
+        """
+        if jabelement is not None and jabelement is not self:
+            return jabelement.release_jabelement()
+        if self._released or self._arena is not None:
+            return
+        self._released = True
+        self.bridge.releaseJavaObject(self.vmid, self.accessible_context)
+        self._count_handles(-1)
+
+    def context_info(self, refresh = False, stats: SearchStats = None) -> AccessibleContextInfo:
+        """
+        Return a snapshot of AccessibleContextInfo, it is fetched once and shared by all readers.
+        Set refresh to fetch it from the bridge again.
+        """
+        if self._info is None or refresh:
+            self._info = self._get_accessible_context_info()
+            if stats is not None:
+                stats.bridge_calls += 1
+        return self._info
 
-    def find_element_by_levels(self, search_levels: Tuple[Dict] | Dict, visible = False, timeout = TIMEOUT) -> JElement:
+    def find_element_by_levels(self, search_levels: Tuple[Dict] | Dict, visible = False, timeout = TIMEOUT, resume = False,
+            strategy = TraversalStrategy.DFS, prune = None, event_driven = False) -> JElement:
         """
         Find element according to levels, each level contains search properties.
         search_levels must be a tuple consisting of dict or a dict.
+        strategy is the TraversalStrategy and prune the PruneRule used by the search of every level.
+        When resume is True, the elements matched by previous attempts are kept as anchors,
+        a retry only searches below the deepest anchor which is still valid.
+        When event_driven is True, a retry also happens as soon as the java virtual machine reports a
+        property, children or focus change, otherwise at the latest after EVENT_FALLBACK_INTERVAL seconds.
         """
         if isinstance(search_levels, dict):
             search_levels = [search_levels]
+        prune = PruneRule.from_value(prune)
 
-        end = time.time() + timeout
-        while True:
+        anchors: List[Tuple[JElement, int]] = []
+
+        def attempt() -> JElement:
+            nonlocal anchors
+            anchors = self._valid_anchors(search_levels, anchors, visible) if resume else []
+            jelement = anchors[-1][0] if anchors else self
+            for search_properties in search_levels[len(anchors):]:
+                jelement = jelement.find_element_by_search_properties(
+                    visible=visible,
+                    strategy=strategy,
+                    prune=prune,
+                    **search_properties)
+                if resume:
+                    anchors.append((jelement, jelement._get_object_depth()))
+            return jelement
+
+        subscription = JEventMonitor.instance(self.bridge).subscribe(self.vmid) if event_driven else None
+        try:
+            return wait_until(
+                attempt, timeout,
+                max_interval=EVENT_FALLBACK_INTERVAL if subscription else MAX_POLL_INTERVAL,
+                ignored_exceptions=IGNORED_EXCEPTIONS,
+                subscription=subscription,
+                reraise=True)
+        finally:
+            if subscription:
+                subscription.close()
+
+    def _valid_anchors(self, search_levels: List[Dict], anchors: List[Tuple[JElement, int]], visible = False) -> List[Tuple[JElement, int]]:
+        """
+        Return the leading anchors which are still attached at the same object depth,
+        still visible if required and still match the search properties of their level.
+        Each anchor costs two bridge calls.
+        An anchor found with a found_index other than 1 is never kept, siblings inserted before it
+        would change which match is the n-th one.
+        """
+        parent = self
+        for level, (search_properties, (anchor, object_depth)) in enumerate(zip(search_levels, anchors)):
+            if search_properties.get('found_index', 1) != 1:
+                return anchors[:level]
             try:
-                jelement = self
-                for search_properties in search_levels:
-                    jelement = jelement.find_element_by_search_properties(
-                        visible=visible,
-                        **search_properties)
-                return jelement
-            except (JElementNotFoundException, JABException) as ex:
-                if (cur:=time.time()) > end:
-                    raise ex
-                time.sleep(min(0.5, end-cur))
-            
-    
-    def find_element_by_search_properties(self, visible = False, **search_properties) -> JElement:
+                if self.bridge.getObjectDepth(self.vmid, anchor.accessible_context) != object_depth:
+                    return anchors[:level]
+                info = anchor.context_info(refresh=True)
+            except JABException:
+                return anchors[:level]
+            if visible and 'showing' not in info.states_en_US.split(','):
+                return anchors[:level]
+            if not parent._compare_func(self._prepare_search_properties(search_properties), anchor):
+                return anchors[:level]
+            parent = anchor
+        return anchors
+
+    def find_element_by_search_properties(self, visible = False, strategy = TraversalStrategy.DFS, prune = None,
+            **search_properties) -> JElement:
         """
         Find element according to search properties.
         Available properties: 
-        - role
+        - role, localized or English
         - name
         - regex_name
         - depth
         - description
         - states
         - found_index
+        - row, column: zero-based cell position, the cell is addressed directly when searching from a table,
+          otherwise only cells of a table at that position match, either of them can be given alone
+        found_index counts matches in the order of the traversal strategy.
+        Children of elements matched by prune (a PruneRule, a mapping of its arguments or a predicate)
+        are never enumerated.
         """
-        return self.find_element(visible=visible, search_properties=search_properties)
+        return self.find_element(visible=visible, search_properties=search_properties, strategy=strategy, prune=prune)
+
+
+    def find_element(self, by = None, value = None, visible = False, *, search_properties = None, strategy = TraversalStrategy.DFS,
+            prune = None, cancel: threading.Event = None) -> JElement:
+        find_properties = self._build_find_properties(by, value, search_properties)
+        for jelement in self.iter_elements(
+                visible=visible, search_properties=find_properties, strategy=strategy, prune=prune, limit=1,
+                cancel=cancel):
+            return jelement
 
+        raise JElementNotFoundException(f'JElement not found for {find_properties}.')
+
+    def find_elements(self, by = None, value = None, visible = False, *, search_properties = None, strategy = TraversalStrategy.DFS,
+            prune = None, start = 1, stop = None, limit = None, cancel: threading.Event = None) -> List[JElement]:
+        """
+        Return all matching elements found in one traversal, see iter_elements.
+        """
+        return list(self.iter_elements(
+            by, value, visible, search_properties=search_properties, strategy=strategy, prune=prune,
+            start=start, stop=stop, limit=limit, cancel=cancel))
 
-    def find_element(self, by = None, value = None, visible = False, *, search_properties = None):
+    def iter_elements(self, by = None, value = None, visible = False, *, search_properties = None, strategy = TraversalStrategy.DFS,
+            prune = None, start = 1, stop = None, limit = None, cancel: threading.Event = None) -> Generator[JElement]:
+        """
+        Generate matching elements lazily in one traversal.
+        start and stop select a one-based range of matches (stop excluded), found_index in search properties
+        overrides start. limit caps the number of generated elements.
+        The traversal stops before visiting the next element once cancel is set.
+        Elements created by the traversal are owned by a JHandleArena which releases them in bulk when the
+        traversal ends, generated elements are promoted and stay valid.
+        """
+        find_properties = self._build_find_properties(by, value, search_properties)
+        prune = PruneRule.from_value(prune)
+        
+        depth = find_properties.get('depth', 0)
+        max_depth = self.depth + depth if depth else 0xffffffff
+
+        start = find_properties.get('found_index', start)
+        if limit is not None and limit <= 0 or stop is not None and stop <= start:
+            return
+        found_index = 0
+        generated = 0
+        stats = SearchStats()
+        self.last_search_stats = stats
+        # children count of the search root may have changed since its last snapshot
+        info = self.context_info(refresh=True, stats=stats)
+        arena = JHandleArena()
+        try:
+            if 'row' in find_properties and 'column' in find_properties and info.role_en_US == 'table':
+                cell = self.get_table_cell(find_properties['row'], find_properties['column'], stats=stats, arena=arena)
+                stats.nodes_visited += 1
+                # the cell is at the position by construction
+                cell_properties = {key: value for key, value in find_properties.items() if key not in ('row', 'column')}
+                if start == 1 and self._compare_func(cell_properties, cell, stats):
+                    yield arena.promote(cell)
+                return
+
+            for descendant in self._generate_all_childs(visible, max_depth, stats, strategy, prune, arena):
+                # print(descendant.role, descendant.depth, descendant.name)
+                if cancel is not None and cancel.is_set():
+                    return
+                stats.nodes_visited += 1
+                if not self._compare_func(find_properties, descendant, stats):
+                    continue
+                found_index += 1
+                if found_index < start:
+                    continue
+                yield arena.promote(descendant)
+                generated += 1
+                if limit is not None and generated >= limit or stop is not None and found_index + 1 >= stop:
+                    return
+        finally:
+            arena.release()
+            self.logger.debug(f'iter_elements {find_properties}: {stats}')
+
+    def _build_find_properties(self, by = None, value = None, search_properties: Mapping = None) -> Dict:
         find_properties = {}
 
         if by and by in [
@@ -162,84 +971,299 @@ class JElement(JABElement):
         if not find_properties:
             raise JException('Must provide at least one element property')
 
-        if 'regex_name' in find_properties:
-            find_properties.update(regex_name=re.compile(find_properties['regex_name']))
-        
-        depth = find_properties.get('depth', 0)
-        max_depth = self.depth + depth if depth else 0xffffffff
-
-        index = find_properties.get('found_index', 1)
-        found_index = 0
-        for descendant in self._generate_all_childs(visible, max_depth):
-            # print(descendant.role, descendant.depth, descendant.name)
-            if self._compare_func(find_properties, descendant):
-                found_index += 1
-                if found_index != index:
-                    continue
-                return descendant
+        return self._prepare_search_properties(find_properties)
 
-        raise JElementNotFoundException(f'JElement not found for {find_properties}.')
+    def _generate_all_childs(self, visible = False, max_depth = 0xffffffff, stats: SearchStats = None,
+            strategy = TraversalStrategy.DFS, prune: PruneRule = None, arena: JHandleArena = None) -> Generator[JElement]:
+        """
+        Generate all descendants in the order of strategy.
+        Traversal uses an explicit stack or queue, max_depth and prune are checked before children of an element are enumerated.
+        Generated elements are adopted by arena when it is given.
+        """
+        if strategy == TraversalStrategy.DFS:
+            yield from self._generate_depth_first(visible, max_depth, stats, prune, arena=arena)
+        elif strategy == TraversalStrategy.BFS:
+            yield from self._generate_breadth_first(visible, max_depth, stats, prune, arena)
+        elif strategy == TraversalStrategy.IDDFS:
+            yield from self._generate_iterative_deepening(visible, max_depth, stats, prune, arena)
+        else:
+            raise JException(f'Unknown traversal strategy: {strategy}')
 
-    def _generate_all_childs(self, visible = False, max_depth = 0xffffffff) -> Generator[JElement]:
+    def _generate_depth_first(self, visible = False, max_depth = 0xffffffff, stats: SearchStats = None,
+            prune: PruneRule = None, limit = 0xffffffff, arena: JHandleArena = None) -> Generator[JElement]:
+        """
+        Pre-order depth first traversal, descendants deeper than limit are not yielded.
+        """
         if max_depth <= self.depth:
             return
 
-        jelement = self
-        # pre:JElement = None
-        for child in self._generate_childs_from_element(jelement, visible):
-            # if pre:
-            #     pre.release_jabelement()
-            # pre = child
+        stack = [self._generate_childs_from_element(self, visible, stats, arena, refresh=False)]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                continue
             yield child
-            yield from child._generate_all_childs(visible, max_depth)
+            if child.depth < max_depth and child.depth < limit and not self._is_pruned(child, prune, stats):
+                stack.append(child._generate_childs_from_element(child, visible, stats, arena, refresh=False))
 
+    def _generate_breadth_first(self, visible = False, max_depth = 0xffffffff, stats: SearchStats = None,
+            prune: PruneRule = None, arena: JHandleArena = None) -> Generator[JElement]:
+        queue = deque([self])
+        while queue:
+            jelement = queue.popleft()
+            if jelement.depth >= max_depth:
+                continue
+            for child in jelement._generate_childs_from_element(jelement, visible, stats, arena, refresh=False):
+                yield child
+                if child.depth < max_depth and not self._is_pruned(child, prune, stats):
+                    queue.append(child)
 
-    def _generate_childs_from_element(self, jelement: JElement = None, visible: bool = False):
+    def _generate_iterative_deepening(self, visible = False, max_depth = 0xffffffff, stats: SearchStats = None,
+            prune: PruneRule = None, arena: JHandleArena = None) -> Generator[JElement]:
+        """
+        Run depth limited traversals with growing limit, each one yields the elements at its limit only.
+        Stops when no element is found at the limit.
+        Every pass creates again the elements above its limit, they are owned by an arena of the pass which
+        is released before the next pass. Yielded elements are adopted by arena, those which are not promoted
+        when the traversal resumes go back to the arena of the pass, so they are valid until the next element.
+        """
+        limit = self.depth + 1
+        while limit <= max_depth:
+            found = False
+            with JHandleArena() as pass_arena:
+                for child in self._generate_depth_first(visible, max_depth, stats, prune, limit, pass_arena):
+                    if child.depth == limit:
+                        found = True
+                        if arena is None:
+                            yield pass_arena.promote(child)
+                            continue
+                        yield arena.adopt(pass_arena.promote(child))
+                        if child._arena is arena:
+                            pass_arena.adopt(arena.promote(child))
+            if not found:
+                return
+            limit += 1
+
+    @staticmethod
+    def _is_pruned(jelement: JElement, prune: Optional[PruneRule], stats: SearchStats = None) -> bool:
+        if prune is None or not prune(jelement, stats):
+            return False
+        if stats is not None:
+            stats.pruned += 1
+        return True
+
+    def _generate_childs_from_element(self, jelement: JElement = None, visible: bool = False, stats: SearchStats = None,
+            arena: JHandleArena = None, refresh = True):
+        """
+        Generate the children of this element.
+        The children count is read from a refreshed snapshot unless refresh is False, traversals pass False since
+        they refresh the search root and read every other element for the first time.
+        """
         jelement = self
         if visible:
             children_count = self._get_visible_children_count(
                 jelement.accessible_context
             )
-            info = self._get_visible_children(jelement.accessible_context)
-            for index in range(children_count):
-                yield JElement(
-                    jelement.bridge,
-                    jelement.hwnd,
-                    jelement.vmid,
-                    info.children[index],
-                    jelement.depth + 1
-                )
+            if stats is not None:
+                stats.bridge_calls += 1
+            start = 0
+            while start < children_count:
+                info = VisibleChildrenInfo()
+                if not jelement.bridge.getVisibleChildren(jelement.vmid, jelement.accessible_context, start, byref(info)):
+                    raise JABException(self.int_func_err_msg.format('getVisibleChildren'))
+                if stats is not None:
+                    stats.bridge_calls += 1
+                    stats.visible_pages += 1
+                returned = min(info.returnedChildrenCount, MAX_VISIBLE_CHILDREN)
+                if returned <= 0:
+                    # children are hidden since they were counted
+                    return
+                # the whole page is used, the bridge returned a reference for each of its children,
+                # wrap the page first, so children which are not generated are still released
+                page = [
+                    JElement(
+                        jelement.bridge,
+                        jelement.hwnd,
+                        jelement.vmid,
+                        info.children[index],
+                        jelement.depth + 1
+                    )
+                    for index in range(returned)
+                ]
+                if arena is not None:
+                    for child in page:
+                        arena.adopt(child)
+                start += len(page)
+                yield from page
         else:
-            for index in range(jelement.children_count):
+            for index in range(jelement.context_info(refresh=refresh, stats=stats).childrenCount):
                 child_acc = jelement.bridge.getAccessibleChildFromContext(
                     jelement.vmid, jelement.accessible_context, index
                 )
-                yield JElement(
+                if stats is not None:
+                    stats.bridge_calls += 1
+                if not child_acc:
+                    # child was removed since the children were counted
+                    continue
+                child = JElement(
                     jelement.bridge, jelement.hwnd, jelement.vmid, child_acc,
                     jelement.depth + 1
                 )
+                yield arena.adopt(child) if arena is not None else child
+
+    @staticmethod
+    def _prepare_search_properties(search_properties: Mapping) -> Dict:
+        """
+        Return a copy of search properties which can be passed to _compare_func
+        """
+        search_properties = dict(search_properties)
+        if isinstance(search_properties.get('regex_name'), str):
+            search_properties.update(regex_name=re.compile(search_properties['regex_name']))
+        return search_properties
 
-    def _compare_func(self, search_properties: Dict, jelement: JElement):
+    def _compare_func(self, search_properties: Dict, jelement: JElement, stats: SearchStats = None):
         """
-        Compare search properties and JElement properties
+        Compare search properties and JElement properties.
+        All properties are read from one context info snapshot of jelement.
         """
+        if 'depth' in search_properties and jelement.depth - self.depth != search_properties['depth']:
+            return False
+        info = jelement.context_info(stats=stats)
         for key, value in search_properties.items():
-            if key == 'role' and jelement.role != value:
+            if key == 'role' and value not in (info.role, info.role_en_US):
                 return False
-            elif key == 'name' and jelement.name != value:
+            elif key == 'name' and info.name != value:
                 return False
-            elif key == 'regex_name' and not value.match(jelement.name):
+            elif key == 'regex_name' and not value.match(info.name):
                 return False
-            elif key == 'depth' and jelement.depth - self.depth != value:
+            elif key == 'description' and info.description != value:
                 return False
-            elif key == 'description' and jelement.description != value:
+            elif key == 'index_in_parent' and info.indexInParent != value:
                 return False
-            elif key == 'index_in_parent' and jelement.index_in_parent != value:
-                return False
-            elif key == 'states' and set(jelement.states.split(',')) != set(value.split(',')):
+            elif key == 'states' and set(info.states.split(',')) != set(value.split(',')):
                 return False
+        # checked last, it needs the parent table
+        if 'row' in search_properties or 'column' in search_properties:
+            return self._is_table_cell_at(jelement, search_properties.get('row'), search_properties.get('column'), stats)
         return True
 
+    @staticmethod
+    def _is_table_cell_at(jelement: JElement, row: int = None, column: int = None, stats: SearchStats = None) -> bool:
+        """
+        Return True when jelement is a cell of its parent table at row and column, None matches any row or column
+        """
+        parent = jelement.get_accessible_parent_from_context()
+        if stats is not None:
+            stats.bridge_calls += 2
+        if parent is None:
+            return False
+        try:
+            if parent.context_info(stats=stats).role_en_US != 'table':
+                return False
+            cell_row, cell_column = parent.get_table_cell_position(jelement)
+            if stats is not None:
+                stats.bridge_calls += 4
+            return (row is None or cell_row == row) and (column is None or cell_column == column)
+        finally:
+            parent.release_jabelement()
+
+    def get_table_cell(self, row: int, column: int = None, header: str = None, stats: SearchStats = None,
+            arena: JHandleArena = None) -> JElement:
+        """
+        Return the cell at zero-based row and column of a table by the Access Bridge table APIs,
+        without enumerating the cells. The column can be given by its header text instead.
+        """
+        if column is None:
+            if header is None:
+                raise JException('Must provide column or header')
+            column = self.find_table_column(header, stats=stats, arena=arena)
+        table = self._get_accessible_table_info()
+        if stats is not None:
+            stats.bridge_calls += 1
+        try:
+            if not (0 <= row < table.rowCount and 0 <= column < table.columnCount):
+                raise JElementNotFoundException(
+                    f'Cell ({row}, {column}) is out of table range ({table.rowCount}, {table.columnCount}).')
+            cell = self._get_table_cell_info(table.accessibleTable, row, column, stats)
+        finally:
+            self._release_table_info(table)
+        cell = JElement(self.bridge, self.hwnd, self.vmid, cell.accessibleContext, self.depth + 1)
+        return arena.adopt(cell) if arena is not None else cell
+
+    def find_table_column(self, header: str, stats: SearchStats = None, arena: JHandleArena = None) -> int:
+        """
+        Return the zero-based index of the table column whose header text is header
+        """
+        headers = AccessibleTableInfo()
+        if not self.bridge.getAccessibleTableColumnHeader(self.vmid, self.accessible_context, byref(headers)):
+            raise JABException(self.int_func_err_msg.format('getAccessibleTableColumnHeader'))
+        if stats is not None:
+            stats.bridge_calls += 1
+        try:
+            for column in range(headers.columnCount):
+                cell = JElement(
+                    self.bridge, self.hwnd, self.vmid,
+                    self._get_table_cell_info(headers.accessibleTable, 0, column, stats).accessibleContext
+                )
+                if arena is not None:
+                    arena.adopt(cell)
+                if cell.context_info(stats=stats).name == header:
+                    return column
+        finally:
+            self._release_table_info(headers)
+        raise JElementNotFoundException(f'Table column not found for header {header}.')
+
+    def get_table_cell_position(self, cell: JElement) -> Tuple[int, int]:
+        """
+        Return zero-based (row, column) of cell, which must be a child of this table
+        """
+        table = self._get_accessible_table_info()
+        try:
+            index = cell.index_in_parent
+            return (
+                self.bridge.getAccessibleTableRow(self.vmid, table.accessibleTable, index),
+                self.bridge.getAccessibleTableColumn(self.vmid, table.accessibleTable, index)
+            )
+        finally:
+            self._release_table_info(table)
+
+    def iter_table_cell_positions(self, cells: Iterable[JElement]) -> Generator[Tuple[JElement, Tuple[int, int]]]:
+        """
+        Generate each of cells, children of this table, with its zero-based (row, column).
+        The table info is read once for all cells, a cell whose info cannot be read anymore is skipped.
+        """
+        table = self._get_accessible_table_info()
+        try:
+            for cell in cells:
+                try:
+                    index = cell.context_info().indexInParent
+                except JABException:
+                    continue
+                yield cell, (
+                    self.bridge.getAccessibleTableRow(self.vmid, table.accessibleTable, index),
+                    self.bridge.getAccessibleTableColumn(self.vmid, table.accessibleTable, index)
+                )
+        finally:
+            self._release_table_info(table)
+
+    def _get_table_cell_info(self, accessible_table: JOBJECT64, row: int, column: int,
+            stats: SearchStats = None) -> AccessibleTableCellInfo:
+        info = AccessibleTableCellInfo()
+        if not self.bridge.getAccessibleTableCellInfo(self.vmid, accessible_table, row, column, byref(info)):
+            raise JABException(self.int_func_err_msg.format('getAccessibleTableCellInfo'))
+        if stats is not None:
+            stats.bridge_calls += 1
+        return info
+
+    def _release_table_info(self, info: AccessibleTableInfo) -> None:
+        """
+        Release Java objects returned in AccessibleTableInfo
+        """
+        for obj in (info.caption, info.summary, info.accessibleContext, info.accessibleTable):
+            if obj:
+                self.bridge.releaseJavaObject(self.vmid, obj)
+
     def get_accessible_child_from_context(self, index: int) -> JElement:
         child_ac = self.bridge.getAccessibleChildFromContext(self.vmid, self.accessible_context, index)
         if self.bridge.getObjectDepth(self.vmid, child_ac) != -1:
@@ -259,6 +1283,55 @@ class JElement(JABElement):
     def set_caret_postision(self, position: int) -> bool:
         return self.bridge.setCaretPosition(self.vmid, self.accessible_context, position)
 
+    def iter_text(self, chunk_size = TEXT_CHUNK_SIZE, start = 0, lines = False, tail = False,
+            poll_frequency = 1, event_driven = False) -> Generator[str]:
+        """
+        Read the text of the element lazily, in ranges of at most chunk_size characters from character offset start.
+        When lines is True complete lines are generated with their line ending instead of chunks.
+        When tail is True the reader waits for appended text instead of stopping at the end, the length is
+        checked every poll_frequency seconds, or as soon as the element reports a change when event_driven.
+        A tail reader starts over from the beginning when the text becomes shorter than what was read.
+        """
+        if not self.context_info(refresh=True).accessibleText:
+            raise JException('Element does not support accessible text')
+        chunk_size = max(1, min(chunk_size, MAX_TEXT_CHUNK_SIZE))
+        buffer = create_string_buffer((chunk_size + 1) * 2)
+        # characters may be split between two ranges
+        decoder = codecs.getincrementaldecoder('utf_16_le')('replace')
+        offset = start
+        pending = ''
+        subscription = JEventMonitor.instance(self.bridge).subscribe(self.vmid, source=self) if tail and event_driven else None
+        try:
+            while True:
+                count = self._get_accessible_text_info().charCount
+                if tail and count < offset:
+                    offset = 0
+                    pending = ''
+                    decoder.reset()
+                while offset < count:
+                    end = min(offset + chunk_size, count)
+                    self._get_accessible_text_range(offset, end - 1, buffer, end - offset + 1)
+                    chunk = decoder.decode(buffer.raw[:(end - offset) * 2])
+                    offset = end
+                    if not lines:
+                        if chunk:
+                            yield chunk
+                        continue
+                    *complete, pending = (pending + chunk).split('\n')
+                    for line in complete:
+                        yield line + '\n'
+                if not tail:
+                    break
+                if subscription:
+                    subscription.wait(poll_frequency)
+                else:
+                    time.sleep(poll_frequency)
+            if pending:
+                yield pending
+        finally:
+            if subscription:
+                subscription.close()
+
     # keyboard function
     def press_key(self, *keys):
         self.win32_utils._press_key(*keys)
@@ -267,55 +1340,38 @@ class JElement(JABElement):
         self.win32_utils._press_hold_release_key(*keys)
 
     def paste_text(self, text, timeout=TIMEOUT):
-        end = time.time() + TIMEOUT
-        while True:
-            try:
-                self.clear(True)
-                self.win32_utils._paste_text(text)
-                self._wait_for_value_to_be(text, self.text)
-                return
-            except:
-                pass
-            if time.time() > end:
-                raise JTimeoutError(f'Failed to paste text, text: {text}')
+        def paste() -> bool:
+            self.clear(True)
+            self.win32_utils._paste_text(text)
+            self._wait_for_value_to_be(text, self.text)
+            return True
+
+        wait_until(paste, timeout, ignored_exceptions=(Exception,), message=f'Failed to paste text, text: {text}')
 
     def simulate_send_text(self, text, timeout=TIMEOUT):
-        end = time.time() + TIMEOUT
-        while True:
-            try:
-                self.send_text(text, True)
-                return
-            except:
-                pass
-            if time.time() > end:
-                raise JTimeoutError(f'Failed to send text, text: {text}')
+        def send() -> bool:
+            self.send_text(text, True)
+            return True
 
+        wait_until(send, timeout, ignored_exceptions=(Exception,), message=f'Failed to send text, text: {text}')
 
     def _wait_for_value_to_be(self, expected_value: Optional[str], actual_value, timeout: int = 5,
                               error_msg_function: str = None):
-        start = time.time()
-        while True:
-            if (
-                    expected_value
-                    and actual_value == expected_value
-                    or not expected_value
-                    and not actual_value
-            ):
-                return
-            current = time.time()
-            elapsed = round(current - start)
-            if elapsed >= timeout:
-                if error_msg_function:
-                    _error_msg = f"Failed to {error_msg_function} in '{timeout}' seconds"
-                else:
-                    _error_msg = f"Failed to wait for expected value '{expected_value}' in '{timeout}' seconds"
-                raise JTimeoutError(_error_msg)
-            actual_value = self.text
+        def matches(value) -> bool:
+            return bool(expected_value and value == expected_value or not expected_value and not value)
+
+        if matches(actual_value):
+            return
+        if error_msg_function:
+            _error_msg = f"Failed to {error_msg_function} in '{timeout}' seconds"
+        else:
+            _error_msg = f"Failed to wait for expected value '{expected_value}' in '{timeout}' seconds"
+        wait_until(lambda: matches(self.text), timeout, message=_error_msg)
 
     @staticmethod
-    def exists(ancestor: JElement, search_levels: Tuple[Dict]|Dict, timeout: float) -> bool:
+    def exists(ancestor: JElement, search_levels: Tuple[Dict]|Dict, timeout: float, prune = None) -> bool:
         try:
-            ancestor.find_element_by_levels(search_levels, timeout=timeout)
+            ancestor.find_element_by_levels(search_levels, timeout=timeout, prune=prune)
             return True
         except JElementNotFoundException:
             pass
@@ -327,25 +1383,35 @@ class JDriverWait:
         self, jdriver: JDriver, 
         timeout = TIMEOUT, 
         poll_frequency = 1, 
-        ignored_exceptions = None):
-
+        ignored_exceptions = None,
+        event_driven = False):
+        """
+        When event_driven is True, the condition is checked again as soon as the java virtual machine of
+        jdriver reports a property, children or focus change, poll_frequency is ignored and the wait between
+        two checks backs off up to EVENT_FALLBACK_INTERVAL seconds.
+        """
         self._jdriver = jdriver
         self._timeout = timeout
         self._poll_frequency = poll_frequency
+        self._event_driven = event_driven
         self.igored_exceptions = ignored_exceptions if ignored_exceptions else IGNORED_EXCEPTIONS
 
     def until(self, method, message = '') -> Any:
-        stacktrace = None
-        end = time.time() + self._timeout
-        while True:
-            try:
-                result = method(self._jdriver)
-                if result:
-                    return result
-            except self.igored_exceptions as ex:
-                stacktrace = getattr(ex, 'stacktrace', None)
-            if time.time() > end:
-                break
-            time.sleep(self._poll_frequency)
-
-        raise JTimeoutError(message, stacktrace)
\ No newline at end of file
+        subscription = self._jdriver.event_monitor.subscribe(self._jdriver.vmid) if self._event_driven else None
+        try:
+            if subscription:
+                return wait_until(
+                    lambda: method(self._jdriver), self._timeout,
+                    max_interval=EVENT_FALLBACK_INTERVAL,
+                    ignored_exceptions=self.igored_exceptions,
+                    subscription=subscription,
+                    message=message)
+            return wait_until(
+                lambda: method(self._jdriver), self._timeout,
+                interval=self._poll_frequency,
+                max_interval=self._poll_frequency,
+                ignored_exceptions=self.igored_exceptions,
+                message=message)
+        finally:
+            if subscription:
+                subscription.close()
\ No newline at end of file
@@ -2,9 +2,9 @@ from __future__ import annotations
 from collections import deque
 from ctypes import byref
 import re
-from typing import Dict, List, Mapping, Tuple
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
 from ...common.exceptions import ParseSelectorError
-from ..pyjab import JDriver, JElement
+from ..pyjab import JABException, JDriver, JElement, JEventKind, JEventMonitor, JEventSubscription, PruneRule
 from pyjab.accessibleinfo import AccessibleActions
 from ..base import PropertyTableModel, UITreeItem
 from PySide6 import QtWidgets, QtCore
@@ -14,35 +14,116 @@ class JABPropertyTableModel(PropertyTableModel):
     pass
 
 class JABTreeItem(UITreeItem):
-    def __init__(self, control: JElement = None, parent: JABTreeItem = None, display_name = None) -> None:
+    __slots__ = ('_depth', '_control', '_role', '_name', '_key', '_display_name', '_data', '_model', '_subscription',
+                 '_children_subscription')
+
+    def __init__(self, control: JElement = None, parent: JABTreeItem = None, display_name = None, occurrence = 0,
+            cell: Tuple[int, int] = None) -> None:
+        """
+        occurrence counts the previous siblings of control having its role and name,
+        cell is the (row, column) of control when it is a cell of a table.
+        """
         if control is None:
             return
         self._depth = getattr(parent, "_depth", -1) + 1
         self._control = control
-        self._role = control.role
-        self._name = control.name
-        self._desc = control.description
+        # label is read from one context info snapshot, other properties when they are shown
+        info = control.context_info()
+        self._role = info.role
+        self._name = info.name
+        self._key = self.key_of(control, parent.key if isinstance(parent, JABTreeItem) else None, occurrence, cell)
         self._display_name = self._role + " " + self._name.title()
-        super().__init__(parent, [display_name or self._display_name])
+        super().__init__(parent, display_name or self._display_name)
 
         self._data = None
         self._model = None
+        self._subscription: Optional[JEventSubscription] = None
+        self._children_subscription: Optional[JEventSubscription] = None
 
     @property
     def control(self) -> JElement:
         return self._control
 
+    @property
+    def key(self) -> Tuple:
+        return self._key
+
+    @staticmethod
+    def key_of(control: JElement, parent_key: Tuple = None, occurrence = 0, cell: Tuple[int, int] = None) -> Tuple:
+        """
+        Return the key of the tree item of control, parent_key is the key of its parent or
+        None for the root element of a java window, occurrence counts the previous siblings having
+        the role and name of control. A table cell is keyed by its (row, column) given by cell instead.
+        """
+        if parent_key is None:
+            return ('hwnd', control.hwnd)
+        if cell is not None:
+            # cells often share role and name, their position is known without reading the other cells
+            return (parent_key, (control.vmid, 'cell', *cell))
+        # references to a java object differ between calls, so (vmid, accessible context) cannot identify it,
+        # the object is recognized by its snapshot and its parent, the key of the parent makes it unique in
+        # the tree. The index in parent is not used, so a sibling added or removed before it keeps the key
+        # unless it has the same role and name. A renamed object gets another key, a refresh replaces its item
+        info = control.context_info()
+        return (parent_key, (control.vmid, info.role, info.name, occurrence))
+
+    @property
+    def search_terms(self) -> Iterable[str]:
+        return (self._role, self._name)
+
+    def is_alive(self) -> bool:
+        # context info of a java object stays readable after it is removed, but a removed object
+        # has no parent anymore, so the parent is compared with the control of the parent item
+        control = self._control
+        try:
+            if not isinstance(self._parent, JABTreeItem):
+                return bool(control.bridge.isJavaWindow(control.hwnd))
+            parent = control.bridge.getAccessibleParentFromContext(control.vmid, control.accessible_context)
+            if not parent:
+                return False
+            try:
+                return bool(control.bridge.isSameObject(control.vmid, parent, self._parent.control.accessible_context))
+            finally:
+                control.bridge.releaseJavaObject(control.vmid, parent)
+        except JABException:
+            return False
+
+    def update_from(self, other: JABTreeItem) -> None:
+        # the java object of this item may be replaced by an equal one
+        self._control = other._control
+
+    def watch_properties(self) -> None:
+        self._subscription = JEventMonitor.instance(self._control.bridge).subscribe(
+            self._control.vmid, self.invalidate_properties, source=self._control)
+
+    def unwatch_properties(self) -> None:
+        if self._subscription:
+            self._subscription.close()
+            self._subscription = None
+
+    def watch_children(self, callback: Callable[[], None]) -> None:
+        # the source of a children change is the parent of the added or removed child
+        self._children_subscription = JEventMonitor.instance(self._control.bridge).subscribe(
+            self._control.vmid, callback, kinds=(JEventKind.CHILDREN,), source=self._control)
+
+    def unwatch_children(self) -> None:
+        if self._children_subscription:
+            self._children_subscription.close()
+            self._children_subscription = None
+
     @property
     def bounds(self) -> str:
-        rect = self._control.bounds
-        return f"X={rect['x']}, Y={rect['y']}, Width={rect['width']}, Height={rect['height']}"
+        info = self._control.context_info()
+        return f"X={info.x}, Y={info.y}, Width={info.width}, Height={info.height}"
 
     @property
     def properties(self):
+        # one fresh snapshot serves all properties but the actions
+        info = self._control.context_info(refresh=True)
         return [
-                self._role, 
-                self._name,
-                self._desc,
+                info.role, 
+                info.name,
+                info.description,
                 self._depth, 
                 self.supported_actions,
                 self.states,
@@ -51,7 +132,7 @@ class JABTreeItem(UITreeItem):
 
     @property
     def states(self) -> str:
-        return ', '.join(self._control.states)
+        return ', '.join(self._control.context_info().states.split(','))
 
     @property
     def supported_actions(self) -> str:
@@ -91,7 +172,8 @@ class JABSelectorHelper:
 
     def _is_control_equal(self, control: JElement, other: JElement, attributes: Dict) -> bool:
         for attribute, value in attributes.items():
-            if getattr(other, attribute) != value:
+            # roles are recorded in English
+            if getattr(other, 'role_en_us' if attribute == 'role' else attribute) != value:
                 return False
         if 'name' not in attributes and (value:=control.name) != other.name:
             attributes['name'] = value
@@ -101,65 +183,82 @@ class JABSelectorHelper:
     def show_selectors_from_control(self, control: JElement, window):
         depth = 0
         selectors = deque()
+        # keys of the tree items need the number of previous siblings having the role and name of the control
+        occurrences = deque()
         while control:
             attributes = {}
-            attributes["role"] = control.role
+            # English role does not depend on the locale of the java application
+            attributes["role"] = control.role_en_us
             if (value := control.name):
                 attributes["name"] = value
             parent = control.get_accessible_parent_from_context()
-            if parent:
+            if parent and parent.role_en_us == 'table':
+                # table cell is addressed and keyed by row and column, no need to scan sibling cells
+                cell = parent.get_table_cell_position(control)
+                selectors.appendleft((control, depth, 1, False, attributes, cell))
+                occurrences.appendleft(0)
+            elif parent:
+                info = control.context_info()
                 index_in_parent = control.index_in_parent - 1
                 sibling = parent.get_accessible_child_from_context(index_in_parent)
                 index = 1
-                pos = 0
+                occurrence = 0
                 sibling_has_children = False
                 while sibling:
-                    pos += 1
                     if self._is_control_equal(control, sibling, attributes):
                         index += 1
-                    if sibling.children_count > 0:
+                    sibling_info = sibling.context_info()
+                    if sibling_info.role == info.role and sibling_info.name == info.name:
+                        occurrence += 1
+                    if sibling_info.childrenCount > 0:
                         sibling_has_children = True
                     index_in_parent -= 1
                     sibling = parent.get_accessible_child_from_context(index_in_parent)
-                selectors.appendleft((control, depth, index, sibling_has_children, pos, attributes))
+                selectors.appendleft((control, depth, index, sibling_has_children, attributes, None))
+                occurrences.appendleft(occurrence)
             else:
-                for i, top_window in enumerate(window.root_item.control.GetChildren()):
-                    if top_window.NativeWindowHandle == control.hwnd:
-                        selectors.appendleft((control, depth, 1, False, i, attributes))
-                        break
+                selectors.appendleft((control, depth, 1, False, attributes, None))
+                occurrences.appendleft(0)
             control = parent
             depth += 1
 
-        window.refresh()
-        tree_item = window.root_item
+        window.clear_selectors()
+        # the root element of the java window is a child of the desktop item
+        keys = []
+        for (control, *_, cell), occurrence in zip(selectors, occurrences):
+            keys.append(JABTreeItem.key_of(control, keys[-1] if keys else None, occurrence, cell))
+        tree_items = window.locate_path(keys)
 
         control: JElement
-        for control, depth, index, sibling_has_children, pos, attributes in selectors:
-            window.show_children(tree_item)
-            tree_item = tree_item.child(pos)
-
+        for i, (control, depth, index, sibling_has_children, attributes, cell) in enumerate(selectors):
+            tree_item = tree_items[i] if i < len(tree_items) else None
             depth = len(selectors) - depth
 
             selector_str = '<java'
             for attr, value in attributes.items():
                 if attr in attributes:
                     selector_str += f" {attr}='{value}'"
+            if cell:
+                selector_str += f' row={cell[0]} col={cell[1]}'
             if index > 1 and depth > 1: # top window no need index
                 selector_str += f' idx={index}'
             selector_str += f' depth={depth}>'
             list_item = QtWidgets.QListWidgetItem(selector_str)
 
-            if sibling_has_children or depth == len(selectors) or depth == 1:
+            # table of a cell selector is the search root of the cell
+            is_table = i + 1 < len(selectors) and selectors[i + 1][-1] is not None
+            if sibling_has_children or depth == len(selectors) or depth == 1 or is_table:
                 list_item.setCheckState(QtCore.Qt.Checked)
-                tree_item.setFont(0, window.checked_font)
+                if tree_item:
+                    window.mark_item(tree_item)
                 list_item.setFont(window.checked_font)
             else:
                 list_item.setCheckState(QtCore.Qt.Unchecked)
 
             window.selector_list.addItem(list_item)
-        window.tree.scrollToItem(tree_item, QtWidgets.QAbstractItemView.PositionAtCenter)
         self.generate_code_from_selectors(window)
-        window.show_properties(tree_item)
+        if len(tree_items) == len(selectors):
+            window.show_properties(tree_items[-1])
 
     def generate_code_from_selectors(self, window):
         window.selector_code_area.clear()
@@ -175,8 +274,11 @@ class JABSelectorHelper:
                 depth_ = attributes['depth'] - depth
                 depth = attributes.pop('depth')
                 index = attributes.pop('found_index', None)
+                row, column = attributes.pop('row', None), attributes.pop('column', None)
                 for attr, value in attributes.items():
                     string += f"{attr}: '{value}', "
+                if row is not None:
+                    string += f"row: {row}, column: {column}, "
                 if index is not None:
                     string += f"found_index: {index}, "
                 string += f"depth: {depth_}"
@@ -186,20 +288,36 @@ class JABSelectorHelper:
                     checked_rows += 1
             else:
                 item.setFont(window.unchecked_font)
+        prune = self.prune_rule_from_selectors(window)
+        prune_arg = f', prune={prune!r}' if prune else ''
         if checked_rows > 1:
             prefix = 'jdriver.find_element_by_levels((\n'
-            surfix = '\n))'
+            surfix = f'\n){prune_arg})'
         else:
             prefix = 'jdriver.find_element_by_levels(\n'
-            surfix = '\n)'
+            surfix = f'{prune_arg}\n)'
         code = prefix + code[:-2] + surfix
         window.selector_code_area.setPlainText(code)
         window.copy_btn.setVisible(True)
 
+    @classmethod
+    def prune_rule_from_selectors(cls, window) -> Optional[PruneRule]:
+        """
+        Build a PruneRule skipping the container roles which are not on the selector path,
+        the target can never be inside such containers.
+        """
+        path_roles = set()
+        for i in range(window.selector_list.count()):
+            role, _ = cls.parse_selector(window.selector_list.item(i).text())
+            path_roles.add(role)
+        roles = tuple(role for role in PruneRule.CONTAINER_ROLES if role not in path_roles)
+        return PruneRule(roles=roles) if roles else None
+
     @staticmethod
     def parse_selector(selector: str) -> Tuple[str, Mapping]:
         pat = re.compile(
             "<java role='(?P<role>.*?)'( name='(?P<name>.*?)')?"
+            "( row=(?P<row>\d+?) col=(?P<col>\d+?))?"
             "( idx=(?P<idx>\d+?))? depth=(?P<depth>\d+?)>",
             re.DOTALL
             )
@@ -212,6 +330,10 @@ class JABSelectorHelper:
                         attributes['role'] = v
                     elif k == 'name' and v is not None:
                         attributes['name'] = v
+                    elif k == 'row' and v is not None:
+                        attributes['row'] = int(v)
+                    elif k == 'col' and v is not None:
+                        attributes['column'] = int(v)
                     elif k == 'idx' and v is not None:
                         attributes['found_index'] = int(v)
                     elif k == 'depth':
@@ -1,89 +1,336 @@
 from __future__ import annotations
 from collections import deque
 import re
-from typing import Dict, List, Mapping, Tuple
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
 from PySide6 import QtWidgets, QtCore
-from PySide6.QtWidgets import QTreeWidgetItem
 from PySide6.QtCore import QAbstractTableModel
-from uiautomation import Control, PatternIdNames, PatternId
+import comtypes
+from uiautomation import Control, ControlConstructors, ControlTypeNames, PatternIdNames, PropertyId, Rect
+from uiautomation.uiautomation import _AutomationClient
 from win32con import *
 from ...common.exceptions import ParseSelectorError
 from ...win32.functions import *
 from ...win32.structures import *
 from ..base import PropertyTableModel, UITreeItem
 
+# properties of the children fetched by one cached UIA request when a tree item is expanded
+PREFETCH_PROPERTIES = (
+    PropertyId.ControlTypeProperty,
+    PropertyId.NameProperty,
+    PropertyId.ClassNameProperty,
+    PropertyId.AutomationIdProperty,
+    PropertyId.BoundingRectangleProperty,
+    PropertyId.IsOffscreenProperty,
+    PropertyId.RuntimeIdProperty,
+    PropertyId.NativeWindowHandleProperty,
+)
+# Is<Pattern>Available property of every pattern, fetched together with STATE_PROPERTIES by one cached request
+PATTERN_AVAILABLE_PROPERTIES = {
+    getattr(PropertyId, f'Is{name}AvailableProperty'): name
+    for name in PatternIdNames.values() if hasattr(PropertyId, f'Is{name}AvailableProperty')
+}
+STATE_PROPERTIES = (
+    PropertyId.IsOffscreenProperty,
+    PropertyId.IsEnabledProperty,
+    PropertyId.IsKeyboardFocusableProperty,
+    PropertyId.HasKeyboardFocusProperty,
+    PropertyId.IsValuePatternAvailableProperty,
+    PropertyId.ValueIsReadOnlyProperty,
+)
+
+# properties whose change invalidates the properties shown for a control
+WATCHED_PROPERTIES = (
+    PropertyId.BoundingRectangleProperty,
+    PropertyId.IsOffscreenProperty,
+    PropertyId.IsEnabledProperty,
+    PropertyId.HasKeyboardFocusProperty,
+    PropertyId.ValueIsReadOnlyProperty,
+)
+
+_property_changed_handler_class = None
+_structure_changed_handler_class = None
+
+def create_property_changed_handler(callback):
+    """
+    Return an IUIAutomationPropertyChangedEventHandler calling callback with no argument,
+    it is called in a thread of UI Automation.
+    """
+    global _property_changed_handler_class
+    if _property_changed_handler_class is None:
+        # interfaces are generated when UI Automation is initialized
+        core = _AutomationClient.instance().UIAutomationCore
+
+        class UIAPropertyChangedHandler(comtypes.COMObject):
+            _com_interfaces_ = [core.IUIAutomationPropertyChangedEventHandler]
+
+            def __init__(self, callback):
+                super().__init__()
+                self._callback = callback
+
+            def HandlePropertyChangedEvent(self, sender, propertyId, newValue):
+                self._callback()
+
+        _property_changed_handler_class = UIAPropertyChangedHandler
+    return _property_changed_handler_class(callback)
+
+def create_structure_changed_handler(callback):
+    """
+    Return an IUIAutomationStructureChangedEventHandler calling callback with no argument,
+    it is called in a thread of UI Automation.
+    """
+    global _structure_changed_handler_class
+    if _structure_changed_handler_class is None:
+        core = _AutomationClient.instance().UIAutomationCore
+
+        class UIAStructureChangedHandler(comtypes.COMObject):
+            _com_interfaces_ = [core.IUIAutomationStructureChangedEventHandler]
+
+            def __init__(self, callback):
+                super().__init__()
+                self._callback = callback
+
+            def HandleStructureChangedEvent(self, sender, changeType, runtimeId):
+                self._callback()
+
+        _structure_changed_handler_class = UIAStructureChangedHandler
+    return _structure_changed_handler_class(callback)
+
+def create_cache_request(property_ids: Iterable[int]):
+    """
+    Return an IUIAutomationCacheRequest of property_ids.
+    """
+    request = _AutomationClient.instance().IUIAutomation.CreateCacheRequest()
+    for property_id in property_ids:
+        request.AddProperty(property_id)
+    return request
+
 class UIAPropertyTableModel(PropertyTableModel):
     pass
 
 
+class UIACachedControl:
+    """
+    A control with the PREFETCH_PROPERTIES read from a cached UIA request, without cross process calls.
+    """
+    def __init__(self, element) -> None:
+        self.control_type = element.CachedControlType
+        self.name = element.CachedName
+        self.class_name = element.CachedClassName
+        self.automation_id = element.CachedAutomationId
+        rect = element.CachedBoundingRectangle
+        self.rect = Rect(rect.left, rect.top, rect.right, rect.bottom)
+        self.is_offscreen = bool(element.CachedIsOffscreen)
+        self.runtime_id = tuple(element.GetCachedPropertyValue(PropertyId.RuntimeIdProperty) or ())
+        self.handle = element.CachedNativeWindowHandle
+        constructor = ControlConstructors.get(self.control_type, Control)
+        self.control = constructor(element=element)
+
+    @property
+    def control_type_name(self) -> str:
+        return ControlTypeNames.get(self.control_type, 'Control')
+
+    def is_top_level(self) -> bool:
+        return bool(self.handle) and GetAncestor(self.handle, GA_ROOT) == self.handle
+
+    @classmethod
+    def children_of(cls, control: Control) -> List[UIACachedControl]:
+        """
+        Return the children of control in raw view order, fetched with their properties by one request.
+        """
+        client = _AutomationClient.instance()
+        elements = control.Element.FindAllBuildCache(
+            client.UIAutomationCore.TreeScope_Children, client.IUIAutomation.CreateTrueCondition(),
+            create_cache_request(PREFETCH_PROPERTIES))
+        if not elements:
+            return []
+        return [cls(elements.GetElement(i)) for i in range(elements.Length)]
+
+
 class UIATreeItem(UITreeItem):
+    __slots__ = ('_depth', '_control', '_cached', '_control_type', '_name', '_display_name', '_class_name', '_id',
+                 '_patterns', '_states', '_handler', '_children_handler', '_runtime_id', '_data', '_model')
 
-    def __init__(self, control: Control = None, parent = None, display_name = None) -> None:
+    def __init__(self, control: Control = None, parent = None, display_name = None, cached: UIACachedControl = None) -> None:
+        """
+        When cached is given, its prefetched properties are used instead of reading them from control.
+        Otherwise only the label is read here, other properties are read when they are shown.
+        """
         if control is None:
             return
         self._depth = getattr(parent, "_depth", -1) + 1
         self._control = control
-        self._control_type = control.ControlTypeName.replace("Control", "")
-        self._name = control.Name
+        self._cached = cached
+        if cached:
+            self._control_type = cached.control_type_name.replace("Control", "")
+            self._name = cached.name
+        else:
+            self._control_type = control.ControlTypeName.replace("Control", "")
+            self._name = control.Name
         self._display_name = self._control_type + " " + self._name.title()
-        super().__init__(parent, [display_name or self._display_name])
-        self._class_name = control.ClassName
-        self._id = control.AutomationId
+        super().__init__(parent, display_name or self._display_name)
+        self._class_name = cached.class_name if cached else None
+        self._id = cached.automation_id if cached else None
+        self._patterns = None
+        self._states = None
+        self._handler = None
+        self._children_handler = None
+        self._runtime_id = None
 
         self._data = None
         self._model = None
 
-    def addChild(self, child: QTreeWidgetItem) -> None:
-        return super().addChild(child)
-
     @property
     def control(self):
         return self._control
 
+    @property
+    def class_name(self) -> str:
+        if self._class_name is None:
+            self._class_name = self._control.ClassName
+        return self._class_name
+
+    @property
+    def automation_id(self) -> str:
+        if self._id is None:
+            self._id = self._control.AutomationId
+        return self._id
+
+    @property
+    def runtime_id(self) -> Tuple[int, ...]:
+        if self._runtime_id is None:
+            self._runtime_id = self._cached.runtime_id if self._cached else tuple(self._control.GetRuntimeId() or ())
+        return self._runtime_id
+
+    @property
+    def key(self) -> Optional[Tuple[int, ...]]:
+        # runtime id of a top level window contains its hwnd
+        return self.runtime_id or None
+
+    @property
+    def search_terms(self) -> Iterable[str]:
+        # class name and automation id are known when prefetched or read for the property table
+        return (self._control_type, self._name, self._class_name, self._id)
+
+    def is_alive(self) -> bool:
+        try:
+            return self._control.Exists(0)
+        except comtypes.COMError:
+            return False
+
+    @staticmethod
+    def key_of(control: Control) -> Optional[Tuple[int, ...]]:
+        """
+        Return the key of the tree item of control.
+        """
+        return tuple(control.GetRuntimeId() or ()) or None
+
+    def update_from(self, other: UIATreeItem) -> None:
+        self._control = other._control
+        self._cached = other._cached
+        self._control_type = other._control_type
+        self._name = other._name
+        self._display_name = other._display_name
+        self._runtime_id = other._runtime_id
+        self._class_name = other._class_name
+        self._id = other._id
+
     @property
     def bounds(self) -> str:
-        rect = self._control.BoundingRectangle
+        rect = self._cached.rect if self._cached else self._control.BoundingRectangle
         return f'X={rect.left}, Y={rect.top}, Width={rect.width()}, Height={rect.height()}'
 
     @property
     def properties(self):
         return [
                 self._control_type, 
-                self._id,
+                self.automation_id,
                 self._name,
-                self._class_name, 
+                self.class_name, 
                 self._depth, 
                 self.supported_patterns,
                 self.states,
                 self.bounds
             ]
 
+    def watch_properties(self) -> None:
+        client = _AutomationClient.instance()
+        self._handler = create_property_changed_handler(self.invalidate_properties)
+        client.IUIAutomation.AddPropertyChangedEventHandler(
+            self._control.Element, client.UIAutomationCore.TreeScope_Element, None, self._handler,
+            list(WATCHED_PROPERTIES))
+
+    def unwatch_properties(self) -> None:
+        if self._handler is None:
+            return
+        handler, self._handler = self._handler, None
+        try:
+            _AutomationClient.instance().IUIAutomation.RemovePropertyChangedEventHandler(self._control.Element, handler)
+        except comtypes.COMError:
+            # element is gone
+            pass
+
+    def watch_children(self, callback: Callable[[], None]) -> None:
+        client = _AutomationClient.instance()
+        self._children_handler = create_structure_changed_handler(callback)
+        # an added child is the sender of its event, a removed child is reported by its parent
+        client.IUIAutomation.AddStructureChangedEventHandler(
+            self._control.Element,
+            client.UIAutomationCore.TreeScope_Element | client.UIAutomationCore.TreeScope_Children,
+            None, self._children_handler)
+
+    def unwatch_children(self) -> None:
+        if self._children_handler is None:
+            return
+        handler, self._children_handler = self._children_handler, None
+        try:
+            _AutomationClient.instance().IUIAutomation.RemoveStructureChangedEventHandler(self._control.Element, handler)
+        except comtypes.COMError:
+            # element is gone
+            pass
+
+    def _reset_properties(self) -> None:
+        self._patterns = None
+        self._states = None
+        # prefetched bounds are outdated, bounds are read from the control from now on
+        if self._cached:
+            self._runtime_id = self._cached.runtime_id
+            self._cached = None
+
     @property
     def states(self) -> str:
+        if self._states is None:
+            self._fetch_patterns_and_states()
+        return self._states
+
+    @property
+    def supported_patterns(self) -> str:
+        if self._patterns is None:
+            self._fetch_patterns_and_states()
+        return self._patterns
+
+    def _fetch_patterns_and_states(self) -> None:
+        """
+        Read pattern availability and state flags by one cached request, the result is kept by the item.
+        """
+        element = self._control.Element.BuildUpdatedCache(
+            create_cache_request((*PATTERN_AVAILABLE_PROPERTIES, *STATE_PROPERTIES)))
+        value = element.GetCachedPropertyValue
+        self._patterns = ', '.join(
+            name for property_id, name in PATTERN_AVAILABLE_PROPERTIES.items() if value(property_id))
+
         st = []
-        if not self._control.IsOffscreen:
+        if not value(PropertyId.IsOffscreenProperty):
             st.append('visible')
-        if self._control.IsEnabled:
+        if value(PropertyId.IsEnabledProperty):
             st.append('enabled')
-        if self._control.IsKeyboardFocusable:
+        if value(PropertyId.IsKeyboardFocusableProperty):
             st.append('focusable')
-        if self._control.HasKeyboardFocus:
+        if value(PropertyId.HasKeyboardFocusProperty):
             st.append('focused')
-        if (pat:=self._control.GetPattern(PatternId.ValuePattern)) and not pat.IsReadOnly and 'enabled' in st:
+        if (value(PropertyId.IsValuePatternAvailableProperty) and not value(PropertyId.ValueIsReadOnlyProperty)
+                and 'enabled' in st):
             st.append('editable')
-
-        return ', '.join(st)
-
-    @property
-    def supported_patterns(self) -> str:
-        patterns = list(
-                dict(
-                    filter(
-                        lambda t: t[1], [(
-                            name, self._control.GetPattern(id_))
-                             for id_, name in PatternIdNames.items()])).keys())
-
-        return ', '.join(patterns)
+        self._states = ', '.join(st)
 
     @property
     def data(self) -> List[List]:
@@ -144,30 +391,27 @@ class UIASelectorHelper:
             if parent:
                 sibling = control.GetPreviousSiblingControl()
                 index = 1
-                pos = 0
                 sibling_has_children = False
                 while sibling:
-                    pos += 1
                     if self._is_control_equal(control, sibling, attributes):
                         index += 1
                     if sibling.GetFirstChildControl():
                         sibling_has_children = True
                     
                     sibling = sibling.GetPreviousSiblingControl()
-                selectors.appendleft((control, depth, index, sibling_has_children, pos, attributes))
+                selectors.appendleft((control, depth, index, sibling_has_children, attributes))
             control = parent
             depth += 1
 
-        window.refresh()
-        tree_item = window.root_item
+        window.clear_selectors()
+        tree_items = window.locate_path([UIATreeItem.key_of(control) for control, *_ in selectors])
         attr_display_map = {
             'Name': 'name',
             'ClassName': 'cls',
             'AutomationId': 'id'
         }
-        for control, depth, index, sibling_has_children, pos, attributes in selectors:
-            window.show_children(tree_item)
-            tree_item = tree_item.child(pos)
+        for i, (control, depth, index, sibling_has_children, attributes) in enumerate(selectors):
+            tree_item = tree_items[i] if i < len(tree_items) else None
 
             depth = len(selectors) - depth
             control_type = control.ControlTypeName.replace('Control', '')
@@ -183,15 +427,16 @@ class UIASelectorHelper:
 
             if sibling_has_children or depth == len(selectors) or depth == 1:
                 list_item.setCheckState(QtCore.Qt.Checked)
-                tree_item.setFont(0, window.checked_font)
+                if tree_item:
+                    window.mark_item(tree_item)
                 list_item.setFont(window.checked_font)
             else:
                 list_item.setCheckState(QtCore.Qt.Unchecked)
 
             window.selector_list.addItem(list_item)
-        window.tree.scrollToItem(tree_item, QtWidgets.QAbstractItemView.PositionAtCenter)
         self.generate_code_from_selectors(window)
-        window.show_properties(tree_item)
+        if len(tree_items) == len(selectors):
+            window.show_properties(tree_items[-1])
 
     def generate_code_from_selectors(self, window):
         window.selector_code_area.clear()
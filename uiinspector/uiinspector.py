@@ -1,23 +1,27 @@
 from __future__ import annotations
 from PySide6 import QtCore, QtWidgets, QtGui
-from PySide6.QtWidgets import QTreeWidget, QTreeWidgetItem
 from PySide6.QtCore import Qt
 from uiautomation import Control, Rect
 import uiautomation as auto
 from win32api import GetSystemMetrics
 from win32con import *
-from .core.pyjab import JDriver, JABException, JElement
+from .core.pyjab import JABException, JElement, JWindowCache
 from .core.tree.jabtree import JABSelectorHelper, JABTreeItem
-from .core.tree.uiatree import UIASelectorHelper, UIATreeItem
+from .core.tree.uiatree import UIACachedControl, UIASelectorHelper, UIATreeItem
 from .win32.functions import *
 from .win32.structures import *
-from .core.base import UITreeItem
+from .core.base import UITreeItem, UITreeModel
 import sys, os
 import mouse, keyboard
 import win32gui, win32api
 import comtypes
 from . import icons
-from typing import Tuple, cast
+from typing import Callable, Dict, Generator, Hashable, Iterable, List, Optional, Set, Tuple, cast
+from collections import Counter, deque
+from functools import partial
+import queue
+import threading
+import time
 from . import *
 
 
@@ -27,6 +31,179 @@ def to_tuple(rect: Rect|None) -> Tuple[int, int, int, int]:
     return 0, 0, 0, 0
     
 
+# number of children handed from a ChildrenLoader to the GUI thread at once
+CHILDREN_CHUNK_SIZE = 50
+
+class ChildrenLoader(QtCore.QThread):
+    """
+    Read the children of a tree item in a worker thread and hand them to the GUI thread in chunks.
+    Each child is a factory which creates the tree item from the read values, without remote calls.
+    """
+    chunk_loaded = QtCore.Signal(object, object)
+    failed = QtCore.Signal(object, str)
+
+    def __init__(self, item: UITreeItem,
+            read_children: Callable[[UITreeItem], Iterable[Callable[[UITreeItem], UITreeItem]]]):
+        super().__init__()
+        self.item = item
+        # message of the exception which ended the loading
+        self.error: Optional[str] = None
+        self._read_children = read_children
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set() or self.isInterruptionRequested()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def run(self) -> None:
+        with auto.UIAutomationInitializerInThread():
+            chunk = []
+            try:
+                for factory in self._read_children(self.item):
+                    if self.cancelled:
+                        return
+                    chunk.append(factory)
+                    if len(chunk) >= CHILDREN_CHUNK_SIZE:
+                        self.chunk_loaded.emit(self, chunk)
+                        chunk = []
+                if chunk and not self.cancelled:
+                    self.chunk_loaded.emit(self, chunk)
+            except Exception as e:
+                # any error of the bridge or COM, the item must not be marked as fetched with part of its children
+                self.error = str(e) or type(e).__name__
+                self.failed.emit(self, self.error)
+
+
+# seconds without a new children change event before the changed items are read
+LIVE_DEBOUNCE = 0.3
+# seconds after which changed items are read even though events keep arriving
+LIVE_MAX_DELAY = 2
+
+class LiveTreeUpdater(QtCore.QThread):
+    """
+    Collect the tree items whose children changed and read their children again in a worker thread.
+    Events arriving until LIVE_DEBOUNCE seconds pass without a new one are handled by one read of each item.
+    """
+    children_read = QtCore.Signal(object, object)
+
+    def __init__(self, read_children: Callable[[UITreeItem], Iterable[Callable[[UITreeItem], UITreeItem]]]):
+        super().__init__()
+        self._read_children = read_children
+        self._changed: Dict[int, UITreeItem] = {}
+        self._changed_lock = threading.Lock()
+        self._event = threading.Event()
+        self._stop = threading.Event()
+
+    def mark_changed(self, item: UITreeItem) -> None:
+        """
+        Read the children of item again, can be called from any thread.
+        """
+        with self._changed_lock:
+            self._changed[id(item)] = item
+        self._event.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._event.set()
+
+    def run(self) -> None:
+        with auto.UIAutomationInitializerInThread():
+            while not self._stop.is_set():
+                self._event.wait()
+                start = time.time()
+                while not self._stop.is_set():
+                    self._event.clear()
+                    if not self._event.wait(LIVE_DEBOUNCE) or time.time() - start >= LIVE_MAX_DELAY:
+                        break
+                with self._changed_lock:
+                    changed, self._changed = self._changed, {}
+                for item in changed.values():
+                    if self._stop.is_set():
+                        return
+                    try:
+                        factories = list(self._read_children(item))
+                    except (comtypes.COMError, JABException, RuntimeError):
+                        # item is gone, its parent reports the change
+                        continue
+                    self.children_read.emit(item, factories)
+
+
+# items whose children are read by one deep crawl, and the seconds it may take
+CRAWL_BUDGET = 5000
+CRAWL_TIMEOUT = 30
+
+class TreeCrawler(QtCore.QThread):
+    """
+    Read the children of the items which are not fetched, breadth first from roots in a worker thread,
+    so that the search index covers them. The GUI thread adds the read children to the tree and hands
+    them back with enqueue. Crawling stops after reading budget items or after timeout seconds.
+    """
+    children_read = QtCore.Signal(object, object)
+
+    def __init__(self, roots: Iterable[UITreeItem],
+            read_children: Callable[[UITreeItem], Iterable[Callable[[UITreeItem], UITreeItem]]],
+            budget = CRAWL_BUDGET, timeout = CRAWL_TIMEOUT):
+        super().__init__()
+        self.read_count = 0
+        self._roots = list(roots)
+        self._read_children = read_children
+        self._budget = budget
+        self._timeout = timeout
+        self._added: queue.Queue[List[UITreeItem]] = queue.Queue()
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set() or self.isInterruptionRequested()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+        # wake the crawler waiting for added children
+        self._added.put([])
+
+    def enqueue(self, children: List[UITreeItem]) -> None:
+        """
+        Hand the children added for a children_read signal back to the crawler, an empty list when none are added.
+        """
+        self._added.put(children)
+
+    def run(self) -> None:
+        with auto.UIAutomationInitializerInThread():
+            end = time.time() + self._timeout
+            pending = deque(self._roots)
+            # children_read signals whose children are not handed back yet
+            waiting = 0
+            while self.read_count < self._budget and not self.cancelled:
+                remaining = end - time.time()
+                if remaining <= 0:
+                    break
+                if not pending:
+                    if waiting <= 0:
+                        break
+                    try:
+                        pending.extend(self._added.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+                    waiting -= 1
+                    continue
+                item = pending.popleft()
+                if item.fetched:
+                    pending.extend(item.children())
+                    continue
+                if item.loading:
+                    continue
+                try:
+                    factories = list(self._read_children(item))
+                except (comtypes.COMError, JABException, RuntimeError):
+                    continue
+                self.read_count += 1
+                waiting += 1
+                self.children_read.emit(item, factories)
+
+
 class ScreenManager:
     def __init__(self, window: MainWindow):
         self.window = window
@@ -270,25 +447,54 @@ class MainWindow(QtWidgets.QMainWindow):
         self.resize(800, 600)
         self.setWindowIcon(QtGui.QIcon(QtGui.QPixmap(":/icons/magnifier.png")))
 
-        self.tree = QTreeWidget()
-        self.tree.setColumnCount(1)
-        self.tree.setHeaderLabels([""])
+        # children are fetched by the model when an item is expanded
+        self.tree_model = UITreeModel(self.load_children)
+        self.tree = QtWidgets.QTreeView()
+        self.tree.setModel(self.tree_model)
         self.tree.header().hide()
         self.tree.setColumnWidth(0, self.tree.width())
         self.tree.setAutoScroll(False)
         self.tree.setExpandsOnDoubleClick(False)
-        # self.tree.setUniformRowHeights(True)
-        self.tree.itemExpanded.connect(self.show_children)
-        self.tree.itemClicked.connect(self.show_properties)
-        self.tree.itemDoubleClicked.connect(self.show_selectors)
-
-        self.root_item = UIATreeItem(auto.GetRootControl(), self.tree, "Desktop")
-        self.show_children(self.root_item)
-        self.root_item.setExpanded(True)
+        self.tree.setUniformRowHeights(True)
+        self.tree.collapsed.connect(self.on_tree_collapsed)
+        self.tree.expanded.connect(self.on_tree_expanded)
+        self.tree_model.rowsAboutToBeRemoved.connect(self.on_tree_rows_removed)
+        self.loaders: Dict[int, ChildrenLoader] = {}
+        self.running_loaders: Set[ChildrenLoader] = set()
+        self.live_updater: Optional[LiveTreeUpdater] = None
+        # stopped updaters and crawlers are kept until their thread ends
+        self.running_updaters: Set[QtCore.QThread] = set()
+        self.live_items: Dict[int, UITreeItem] = {}
+        # items of the shown selectors
+        self.marked_items: List[UITreeItem] = []
+        QtGui.QShortcut(QtGui.QKeySequence(Qt.Key_Escape), self.tree, self.cancel_all_loading)
+        self.tree.clicked.connect(self.on_tree_clicked)
+        self.tree.doubleClicked.connect(self.on_tree_double_clicked)
+
+        self.show_root()
+
+        # search of the loaded items, results are shown above the tree
+        self.search_box = QtWidgets.QLineEdit()
+        self.search_box.setPlaceholderText("Search loaded items")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.textChanged.connect(self.search)
+        self.search_results = QtWidgets.QListWidget()
+        self.search_results.setMaximumHeight(150)
+        self.search_results.hide()
+        self.search_results.itemClicked.connect(self.show_search_result)
+        self.search_results.itemActivated.connect(self.show_search_result)
+        # results are updated once the crawled items are added
+        self.search_timer = QtCore.QTimer()
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(lambda: self.search(self.search_box.text()))
+        self.crawler: Optional[TreeCrawler] = None
 
         # create first groupbox
         self.groupbox = QtWidgets.QGroupBox("Visual Tree")
         self.groupbox.setLayout(QtWidgets.QVBoxLayout())
+        self.groupbox.layout().addWidget(self.search_box)
+        self.groupbox.layout().addWidget(self.search_results)
         self.groupbox.layout().addWidget(self.tree)
 
         # create list widget with check box for selectors
@@ -391,6 +597,15 @@ class MainWindow(QtWidgets.QMainWindow):
         self.uia_action.setCheckable(True)
         self.uia_action.setChecked(True)
 
+        self.live_action = QtGui.QAction("Live Tree", self)
+        self.live_action.setShortcut("Ctrl+L")
+        self.live_action.setCheckable(True)
+        self.live_action.toggled.connect(self.set_live)
+
+        self.crawl_action = QtGui.QAction("Deep Search", self)
+        self.crawl_action.setCheckable(True)
+        self.crawl_action.toggled.connect(self.set_crawling)
+
         exit_action = QtGui.QAction('Exit', self)
         exit_action.triggered.connect(self.close)
 
@@ -406,7 +621,7 @@ class MainWindow(QtWidgets.QMainWindow):
         file_menu.addAction(exit_action)
         tools_menu.addActions([refresh_action, indicate_action, self.highlight_action])
         option_menu = tools_menu.addMenu(QtGui.QIcon(QtGui.QPixmap(":/icons/options.png")), 'Options')
-        option_menu.addActions([self.jab_action, self.uia_action])
+        option_menu.addActions([self.jab_action, self.uia_action, self.live_action, self.crawl_action])
         help_menu.addAction(about_action)
 
         menu.setStyleSheet("background: rgba(171, 240, 173, 0.75);")
@@ -418,6 +633,21 @@ class MainWindow(QtWidgets.QMainWindow):
         self.jab_label = QtWidgets.QLabel('java access bridge')
         self.setStatusBar(self.statusbar)
 
+    def closeEvent(self, event: QtGui.QCloseEvent) -> None:
+        # event handlers must not outlive the window
+        self.live_action.setChecked(False)
+        self.crawl_action.setChecked(False)
+        self.cancel_all_loading()
+        # a thread destroyed while it runs aborts the process
+        threads = [*self.running_loaders, *self.running_updaters]
+        for thread in threads:
+            thread.requestInterruption()
+        for thread in threads:
+            # a thread cannot be terminated safely inside a bridge or COM call,
+            # it ends at its next check of the interruption
+            thread.wait()
+        super().closeEvent(event)
+
     def minimize(self):
         """
         Minimize main window
@@ -473,45 +703,427 @@ class MainWindow(QtWidgets.QMainWindow):
         self.restore()
 
     def refresh(self):
-        # remove all items from tree
-        self.tree.clear()
+        """
+        Update the tree from the live controls, only the children which changed are inserted or removed,
+        so expanded and selected items stay as they are.
+        """
+        self.cancel_all_loading()
+        UITreeItem.unwatch_all()
+        self.clear_selectors()
+        JWindowCache.instance().purge()
+        self.refresh_children(self.root_item)
+        if not self.tree.currentIndex().isValid():
+            self.property_table.setModel(None)
+
+    def clear_selectors(self) -> None:
         self.selector_list.clear()
         self.selector_code_area.clear()
         self.copy_btn.setVisible(False)
-        self.property_table.setModel(None)
         self.highlight_action.setChecked(False)
         self.highlight_action.setEnabled(False)
-        self.root_item = UIATreeItem(auto.GetRootControl(), self.tree, "Desktop")
+        for item in self.marked_items:
+            if self.tree_model.contains(item):
+                self.tree_model.set_font(item, None)
+        self.marked_items = []
+
+    def mark_item(self, item: UITreeItem) -> None:
+        """
+        Show item with the font of checked selectors, until the selectors are cleared.
+        """
+        self.tree_model.set_font(item, self.checked_font)
+        self.marked_items.append(item)
+
+    def locate_path(self, path: List[Hashable]) -> List[UITreeItem]:
+        """
+        Return the items along path, the keys of the items below the root item, and make the last one current.
+        The search starts at the deepest loaded item of path, only the levels which are not fetched yet are read,
+        and a fetched level without the key is read again once. The returned items are fewer when a key is not found.
+        """
+        items: List[UITreeItem] = []
+        item = self.root_item
+        for depth in range(len(path) - 1, -1, -1):
+            if path[depth] is None or (found := self.tree_model.find_item(path[depth])) is None:
+                continue
+            ancestors = self.ancestors(found)
+            if len(ancestors) == depth + 1 and found.is_alive():
+                items = ancestors
+                item = found
+            break
+        try:
+            for key in path[len(items):]:
+                self.show_children(item)
+                child = self.find_child(item, key)
+                if child is None:
+                    # children changed since they were fetched
+                    self.diff_children(item, list(self.read_children(item)))
+                    child = self.find_child(item, key)
+                if child is None:
+                    break
+                items.append(child)
+                item = child
+        except (comtypes.COMError, JABException, RuntimeError):
+            pass
+        if items:
+            self.reveal_item(items[-1])
+        return items
+
+    def reveal_item(self, item: UITreeItem) -> None:
+        """
+        Expand the ancestors of item, make it current and scroll to it.
+        """
+        for parent in [self.root_item] + self.ancestors(item)[:-1]:
+            self.tree.expand(self.tree_model.index_of(parent))
+        index = self.tree_model.index_of(item)
+        self.tree.setCurrentIndex(index)
+        self.tree.scrollTo(index, QtWidgets.QAbstractItemView.PositionAtCenter)
+
+    @QtCore.Slot(str)
+    def search(self, text: str) -> None:
+        self.search_results.clear()
+        items = self.tree_model.search_index.search(text)
+        for item in items:
+            list_item = QtWidgets.QListWidgetItem(item.label)
+            list_item.setData(Qt.UserRole, item)
+            list_item.setToolTip(' > '.join(ancestor.label for ancestor in self.ancestors(item)))
+            self.search_results.addItem(list_item)
+        self.search_results.setVisible(bool(text))
+
+    @QtCore.Slot(QtWidgets.QListWidgetItem)
+    def show_search_result(self, list_item: QtWidgets.QListWidgetItem) -> None:
+        item = list_item.data(Qt.UserRole)
+        if not self.tree_model.contains(item):
+            # removed by a refresh
+            self.search(self.search_box.text())
+            return
+        self.reveal_item(item)
+        self.show_properties(item)
+
+    @QtCore.Slot(bool)
+    def set_crawling(self, enabled: bool) -> None:
+        """
+        Start or stop reading the items which are not expanded, so the search covers them.
+        """
+        if enabled and self.crawler is None:
+            self.crawler = TreeCrawler([self.root_item], self.read_children)
+            self.crawler.children_read.connect(self.add_crawled_children)
+            self.crawler.finished.connect(self.crawling_finished)
+            self.running_updaters.add(self.crawler)
+            self.crawler.start()
+        elif not enabled and self.crawler is not None:
+            self.crawler.cancel()
+
+    @QtCore.Slot(object, object)
+    def add_crawled_children(self, item: UITreeItem, factories: List[Callable[[UITreeItem], UITreeItem]]) -> None:
+        crawler = cast(TreeCrawler, self.sender())
+        if crawler.cancelled:
+            return
+        if self.tree_model.contains(item) and not item.fetched and not item.loading:
+            self.tree_model.insert_children(item, [factory(parent=item) for factory in factories])
+            self.tree_model.set_fetched(item)
+            if self.search_box.text():
+                self.search_timer.start()
+        crawler.enqueue(item.children() if self.tree_model.contains(item) else [])
+
+    @QtCore.Slot()
+    def crawling_finished(self) -> None:
+        crawler = cast(TreeCrawler, self.sender())
+        self.running_updaters.discard(crawler)
+        crawler.deleteLater()
+        if crawler is not self.crawler:
+            return
+        self.crawler = None
+        self.statusbar.showMessage(
+            f'{len(self.tree_model.search_index)} items indexed, children of {crawler.read_count} items read', 5000)
+        self.crawl_action.setChecked(False)
+
+    def find_child(self, parent: UITreeItem, key: Hashable) -> Optional[UITreeItem]:
+        child = self.tree_model.find_item(key) if key is not None else None
+        return child if child is not None and child.parent_item is parent else None
+
+    def ancestors(self, item: UITreeItem) -> List[UITreeItem]:
+        """
+        Return the items from the child of the root item down to item.
+        """
+        items = []
+        while item is not None and item is not self.root_item:
+            items.append(item)
+            item = item.parent_item
+        items.reverse()
+        return items
+
+    def refresh_children(self, parent: UITreeItem) -> None:
+        """
+        Diff the children of parent against its live children by key, then refresh the expanded children.
+        Children of a collapsed item are dropped, they are fetched again when it is expanded.
+        """
+        if not parent.fetched:
+            return
+        if parent is not self.root_item and not self.tree.isExpanded(self.tree_model.index_of(parent)):
+            self.tree_model.clear_children(parent)
+            return
+        try:
+            factories = list(self.read_children(parent))
+        except (comtypes.COMError, JABException, RuntimeError):
+            # parent is gone since its parent was read
+            self.tree_model.clear_children(parent)
+            return
+        for child in self.diff_children(parent, factories):
+            self.refresh_children(child)
+
+    def diff_children(self, parent: UITreeItem, factories: List[Callable[[UITreeItem], UITreeItem]]) -> List[UITreeItem]:
+        """
+        Replace the children of parent by the children created by factories, a current child whose key
+        matches a created one is kept. Return the new children.
+        """
+        current = {}
+        for child in parent.children():
+            if child.key is not None:
+                current.setdefault(child.key, child)
+        children = []
+        for factory in factories:
+            live = factory(parent=parent)
+            child = current.pop(live.key, None) if live.key is not None else None
+            if child is None:
+                children.append(live)
+                continue
+            self.tree_model.update_item(child, live)
+            child.invalidate_properties()
+            children.append(child)
+        self.tree_model.sync_children(parent, children)
+        return children
+
+    @QtCore.Slot(bool)
+    def set_live(self, enabled: bool) -> None:
+        """
+        Start or stop patching the expanded items from their children change events.
+        """
+        if enabled and self.live_updater is None:
+            self.live_updater = LiveTreeUpdater(self.read_children)
+            self.live_updater.children_read.connect(self.apply_live_children)
+            self.live_updater.finished.connect(self.live_updater_finished)
+            self.running_updaters.add(self.live_updater)
+            self.live_updater.start()
+            for item in self.expanded_items(self.root_item):
+                self.watch_live(item)
+        elif not enabled and self.live_updater is not None:
+            for item in list(self.live_items.values()):
+                self.unwatch_live(item)
+            self.live_updater.stop()
+            self.live_updater = None
+
+    @QtCore.Slot()
+    def live_updater_finished(self) -> None:
+        updater = cast(LiveTreeUpdater, self.sender())
+        self.running_updaters.discard(updater)
+        updater.deleteLater()
+
+    def expanded_items(self, item: UITreeItem) -> Generator[UITreeItem]:
+        """
+        Yield item and its shown descendants which are expanded and whose children are fetched.
+        """
+        stack = [item]
+        while stack:
+            item = stack.pop()
+            if item.fetched and (item is self.root_item or self.tree.isExpanded(self.tree_model.index_of(item))):
+                yield item
+                stack.extend(item.children())
+
+    def watch_live(self, item: UITreeItem) -> None:
+        if self.live_updater is None or id(item) in self.live_items:
+            return
+        try:
+            item.watch_children(partial(self.live_updater.mark_changed, item))
+        except (comtypes.COMError, JABException):
+            return
+        self.live_items[id(item)] = item
+
+    def unwatch_live(self, item: UITreeItem) -> None:
+        if self.live_items.pop(id(item), None) is not None:
+            item.unwatch_children()
+
+    def unwatch_live_subtree(self, item: UITreeItem) -> None:
+        stack = [item]
+        while stack:
+            item = stack.pop()
+            self.unwatch_live(item)
+            stack.extend(item.children())
+
+    @QtCore.Slot(object, object)
+    def apply_live_children(self, item: UITreeItem, factories: List[Callable[[UITreeItem], UITreeItem]]) -> None:
+        if id(item) not in self.live_items or not item.fetched or item.loading or not self.tree_model.contains(item):
+            return
+        self.diff_children(item, factories)
+
+    @QtCore.Slot(QtCore.QModelIndex, int, int)
+    def on_tree_rows_removed(self, parent: QtCore.QModelIndex, first: int, last: int) -> None:
+        item = self.tree_model.item(parent)
+        if not self.live_items or not isinstance(item, UITreeItem):
+            return
+        # the loading placeholder is the row after the children
+        for row in range(first, min(last + 1, item.childCount())):
+            self.unwatch_live_subtree(item.child(row))
+
+    def show_root(self) -> None:
+        """
+        Replace all items of the tree by the expanded desktop item.
+        """
+        self.root_item = UIATreeItem(auto.GetRootControl(), None, "Desktop")
+        self.tree_model.set_roots([self.root_item])
         self.show_children(self.root_item)
-        self.root_item.setExpanded(True)
+        self.tree.expand(self.tree_model.index_of(self.root_item))
+
+    @QtCore.Slot(QtCore.QModelIndex)
+    def on_tree_collapsed(self, index: QtCore.QModelIndex) -> None:
+        item = self.tree_model.item(index)
+        if isinstance(item, UITreeItem):
+            self.cancel_loading(item)
+            if item.load_error is not None:
+                # children are loaded again by next expand
+                self.tree_model.clear_children(item)
+            if self.live_items:
+                self.unwatch_live_subtree(item)
+
+    @QtCore.Slot(QtCore.QModelIndex)
+    def on_tree_expanded(self, index: QtCore.QModelIndex) -> None:
+        item = self.tree_model.item(index)
+        if self.live_updater is None or not isinstance(item, UITreeItem):
+            return
+        # children shown again may have changed while they were not watched
+        for expanded in self.expanded_items(item):
+            self.watch_live(expanded)
+            self.live_updater.mark_changed(expanded)
+
+    @QtCore.Slot(QtCore.QModelIndex)
+    def on_tree_clicked(self, index: QtCore.QModelIndex) -> None:
+        self.show_properties(self.tree_model.item(index))
+
+    @QtCore.Slot(QtCore.QModelIndex)
+    def on_tree_double_clicked(self, index: QtCore.QModelIndex) -> None:
+        item = self.tree_model.item(index)
+        if isinstance(item, UITreeItem):
+            self.show_selectors(item)
 
     @QtCore.Slot(UITreeItem)
     def show_children(self, parent: UITreeItem) -> None:
-        if parent.childCount() > 0:
+        """
+        Read and show children of parent in GUI thread, a background loading of parent is replaced.
+        """
+        if parent.fetched:
             return
+        self.cancel_loading(parent)
+        if parent.load_error is not None:
+            self.tree_model.clear_children(parent)
+        self.tree_model.insert_children(parent, [factory(parent=parent) for factory in self.read_children(parent)])
+        self.tree_model.set_fetched(parent)
+        if self.tree.isExpanded(self.tree_model.index_of(parent)):
+            self.watch_live(parent)
+
+    @QtCore.Slot(UITreeItem)
+    def load_children(self, parent: UITreeItem) -> None:
+        """
+        Read children of parent in a worker thread, a placeholder is shown until they are all added.
+        """
+        if parent.fetched or parent.loading:
+            return
+        self.tree_model.set_loading(parent, True)
+        loader = ChildrenLoader(parent, self.read_children)
+        loader.chunk_loaded.connect(self.add_children)
+        loader.failed.connect(self.loading_failed)
+        loader.finished.connect(self.loading_finished)
+        self.loaders[id(parent)] = loader
+        # cancelled loaders are kept until their thread ends
+        self.running_loaders.add(loader)
+        loader.start()
+
+    @staticmethod
+    def read_children(parent: UITreeItem) -> Generator[Callable[[UITreeItem], UITreeItem]]:
+        """
+        Read the children of parent, yield for each one a factory creating its tree item without remote calls.
+        """
         # java control
         if isinstance(parent, JABTreeItem):
-            for child in parent.control._generate_childs_from_element():
-                child_item = JABTreeItem(child, parent)
-                child_item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+            # children added since the parent snapshot are counted by the refreshed one
+            children = parent.control._generate_childs_from_element(refresh=True)
+            if parent.control.context_info().role_en_US == 'table':
+                # cells are keyed by their position, the table info is read once for all of them
+                for child, cell in parent.control.iter_table_cell_positions(children):
+                    yield partial(JABTreeItem, child, cell=cell)
+                return
+            # children with the same role and name are told apart by their order
+            occurrences = Counter()
+            for child in children:
+                try:
+                    # label of the tree item is read from the snapshot
+                    info = child.context_info()
+                except JABException:
+                    # child was removed while its siblings are read
+                    continue
+                occurrence = occurrences[(info.role, info.name)]
+                occurrences[(info.role, info.name)] += 1
+                yield partial(JABTreeItem, child, occurrence=occurrence)
         else:
             parent = cast(UIATreeItem, parent)
-            for child in parent.control.GetChildren():
-                if child.IsTopLevel():
-                    try:
-                        java_window = JDriver(hwnd = child.NativeWindowHandle)
-                    except (FileNotFoundError, RuntimeError):
-                        child_item = UIATreeItem(child, parent, child.Name)
+            # children and their displayed properties are fetched by one cached request
+            for cached in UIACachedControl.children_of(parent.control):
+                if cached.is_top_level():
+                    java_window = JWindowCache.instance().driver(cached.handle)
+                    if java_window is None:
+                        yield partial(UIATreeItem, cached.control, display_name=cached.name, cached=cached)
                     else:
-                        child_item = JABTreeItem(java_window._root_element, parent, java_window._root_element.name)
+                        # the refreshed snapshot also serves the label of the tree item
+                        name = java_window.root_element.context_info(refresh=True).name
+                        yield partial(JABTreeItem, java_window.root_element, display_name=name)
                 else:
-                    child_item = UIATreeItem(child, parent)
-                child_item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
-        if parent.childCount() <= 0:
-            parent.setChildIndicatorPolicy(QTreeWidgetItem.DontShowIndicator)
+                    yield partial(UIATreeItem, cached.control, cached=cached)
+
+    @QtCore.Slot(object, object)
+    def add_children(self, loader: ChildrenLoader, factories: List[Callable[[UITreeItem], UITreeItem]]) -> None:
+        if loader.cancelled or self.loaders.get(id(loader.item)) is not loader:
+            return
+        # the placeholder stays the last row
+        self.tree_model.insert_children(loader.item, [factory(parent=loader.item) for factory in factories])
+
+    @QtCore.Slot(object, str)
+    def loading_failed(self, loader: ChildrenLoader, message: str) -> None:
+        if not loader.cancelled:
+            self.statusbar.showMessage(message, 5000)
+
+    @QtCore.Slot()
+    def loading_finished(self) -> None:
+        loader = cast(ChildrenLoader, self.sender())
+        self.running_loaders.discard(loader)
+        if self.loaders.get(id(loader.item)) is loader:
+            del self.loaders[id(loader.item)]
+            if loader.error is not None and not loader.cancelled:
+                # fetched again when expanded after a collapse
+                self.tree_model.set_load_error(loader.item, loader.error)
+            elif not loader.cancelled:
+                self.tree_model.set_loading(loader.item, False)
+                self.tree_model.set_fetched(loader.item)
+                if self.tree.isExpanded(self.tree_model.index_of(loader.item)):
+                    self.watch_live(loader.item)
+        loader.deleteLater()
+
+    @QtCore.Slot(UITreeItem)
+    def cancel_loading(self, parent: UITreeItem) -> None:
+        """
+        Stop loading children of parent, the partly loaded children are removed.
+        """
+        loader = self.loaders.pop(id(parent), None)
+        if loader is None:
+            return
+        loader.cancel()
+        self.tree_model.clear_children(parent)
+
+    def cancel_all_loading(self) -> None:
+        for loader in list(self.loaders.values()):
+            self.cancel_loading(loader.item)
 
     @QtCore.Slot(UITreeItem)
     def show_properties(self, item: UITreeItem) -> None:
+        if not isinstance(item, UITreeItem):
+            # loading placeholder
+            return
         try:
             item.update_property_table(self.property_table)
 
@@ -524,9 +1136,8 @@ class MainWindow(QtWidgets.QMainWindow):
         x, y = win32gui.GetCursorPos()
         hwnd = win32gui.WindowFromPoint((x, y))
         hwnd = GetAncestor(hwnd, GA_ROOT)
-        try:
-            jdriver = JDriver(hwnd = hwnd)
-        except (FileNotFoundError, RuntimeError):
+        jdriver = JWindowCache.instance().driver(hwnd)
+        if jdriver is None:
             control = auto.ControlFromPoint(x, y)
         else:
             control = jdriver.get_accessible_context_at(x, y)
@@ -579,8 +1190,12 @@ class MainWindow(QtWidgets.QMainWindow):
         if (row:=self.selector_list.item(0).text()).startswith('<java'):
             depth = 1
             _, attributes = JABSelectorHelper.parse_selector(row)
+            prune = JABSelectorHelper.prune_rule_from_selectors(self)
             try:
-                jdriver = JDriver(attributes['name'], timeout=0)
+                # drivers of java windows are created once and cached
+                jdriver = JWindowCache.instance().driver_by_title(attributes['name'])
+                if jdriver is None:
+                    raise JABException(f"no java window found by title '{attributes['name']}'")
                 levels = []
                 for i in range(1, self.selector_list.count()):
                     item = self.selector_list.item(i)
@@ -588,8 +1203,8 @@ class MainWindow(QtWidgets.QMainWindow):
                         _, attributes = JABSelectorHelper.parse_selector(item.text())
                         attributes['depth'], depth = attributes['depth'] - depth, attributes['depth']
                         levels.append(dict(**attributes))
-                if JElement.exists(jdriver.root_element, levels, 0):
-                    bounds = jdriver.root_element.find_element_by_levels(levels, timeout=0).bounds
+                if JElement.exists(jdriver.root_element, levels, 0, prune=prune):
+                    bounds = jdriver.root_element.find_element_by_levels(levels, timeout=0, prune=prune).bounds
                     p1 = POINT(bounds['x'], bounds['y'])
                     LogicalToPhysicalPointForPerMonitorDPI(jdriver.hwnd, byref(p1))
 